@@ -0,0 +1,362 @@
+"""sspeedup.api 基准测试套件
+
+在进程内通过 ASGI 调用 Litestar 与 Sanic 应用，覆盖响应编码、数据校验、
+异常处理等路径，每个用例输出一行 JSON（吞吐量与延迟分位数）。
+
+Sanic 自带的测试客户端在每次请求时都会重新执行启动流程，无法用于大量请求，
+因此两个框架均只执行一次 lifespan 启动，之后通过 httpx.ASGITransport 发送请求。
+
+用法：
+    python benchmarks/api_suite.py [-n 请求数] [-k 用例名过滤] [-o 结果文件]
+        [--baseline 基准结果文件] [--threshold 允许的吞吐量下降比例]
+
+传入 --baseline 时，与基准结果对比，存在吞吐量下降超过阈值的用例时以状态码 1 退出。
+"""
+import logging
+import sys
+from argparse import ArgumentParser
+from asyncio import Queue, Task, create_task, run
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from httpx import ASGITransport, AsyncClient
+from litestar import Litestar, Response, get, post
+from litestar.status_codes import HTTP_400_BAD_REQUEST
+from msgspec import Struct
+from msgspec.json import decode, encode
+from sanic import HTTPResponse, Request, Sanic
+
+from sspeedup.api.code import Code
+from sspeedup.api.error_reporter import ErrorReporter, set_error_reporter
+from sspeedup.api.litestar import (
+    EXCEPTION_HANDLERS,
+    REQUEST_STRUCT_CONFIG,
+    fail,
+    success,
+)
+from sspeedup.api.sanic import BaseModel, get_response_json, inject_pydantic_model
+
+
+def _make_items(count: int) -> List[Dict[str, Any]]:
+    return [
+        {"id": i, "name": f"item-{i}", "score": i * 0.5, "tags": ["a", "b", "c"]}
+        for i in range(count)
+    ]
+
+
+PAYLOAD_SIZES: Dict[str, int] = {"small": 1, "medium": 100, "large": 2000}
+PAYLOADS: Dict[str, List[Dict[str, Any]]] = {
+    name: _make_items(count) for name, count in PAYLOAD_SIZES.items()
+}
+REQUEST_BODIES: Dict[str, bytes] = {
+    name: encode({"items": items}) for name, items in PAYLOADS.items()
+}
+INVALID_BODY = b'{"items": [{"id": "x", "name": 1, "score": 0, "tags": []}]}'
+MALFORMED_BODY = b'{"items": [{"id": 1, '
+
+
+# ---------- Litestar ----------
+
+
+class ItemStruct(Struct, **REQUEST_STRUCT_CONFIG):
+    id: int
+    name: str
+    score: float
+    tags: List[str]
+
+
+class ItemsStruct(Struct, **REQUEST_STRUCT_CONFIG):
+    items: List[ItemStruct]
+
+
+@get("/success/empty")
+async def litestar_success_empty() -> Response:
+    return success()
+
+
+@get("/success/{size:str}")
+async def litestar_success(size: str) -> Response:
+    return success(data=PAYLOADS[size])
+
+
+@get("/fail")
+async def litestar_fail() -> Response:
+    return fail(http_code=HTTP_400_BAD_REQUEST, api_code=Code.BAD_ARGUMENTS)
+
+
+@get("/fail/msg")
+async def litestar_fail_msg() -> Response:
+    return fail(
+        http_code=HTTP_400_BAD_REQUEST, api_code=Code.BAD_ARGUMENTS, msg="参数错误"
+    )
+
+
+@post("/items")
+async def litestar_items(data: ItemsStruct) -> Response:
+    return success(data={"count": len(data.items)})
+
+
+@get("/error")
+async def litestar_error() -> Response:
+    raise RuntimeError("benchmark")
+
+
+litestar_app = Litestar(
+    [
+        litestar_success_empty,
+        litestar_success,
+        litestar_fail,
+        litestar_fail_msg,
+        litestar_items,
+        litestar_error,
+    ],
+    exception_handlers=EXCEPTION_HANDLERS,
+)
+
+
+# ---------- Sanic ----------
+
+
+class ItemModel(BaseModel):
+    id: int
+    name: str
+    score: float
+    tags: List[str]
+
+
+class ItemsModel(BaseModel):
+    items: List[ItemModel]
+
+
+sanic_app = Sanic("sspeedup-benchmark", configure_logging=False)
+
+
+@sanic_app.get("/success/empty")
+async def sanic_success_empty(request: Request) -> HTTPResponse:
+    del request
+    return get_response_json(code=Code.SUCCESS)
+
+
+@sanic_app.get("/success/<size:str>")
+async def sanic_success(request: Request, size: str) -> HTTPResponse:
+    del request
+    return get_response_json(code=Code.SUCCESS, data={"items": PAYLOADS[size]})
+
+
+@sanic_app.get("/fail")
+async def sanic_fail(request: Request) -> HTTPResponse:
+    del request
+    response = get_response_json(code=Code.BAD_ARGUMENTS)
+    response.status = 400
+    return response
+
+
+@sanic_app.post("/items")
+@inject_pydantic_model(ItemsModel)
+async def sanic_items(request: Request, data: ItemsModel) -> HTTPResponse:
+    del request
+    return get_response_json(code=Code.SUCCESS, data={"count": len(data.items)})
+
+
+@sanic_app.get("/query")
+@inject_pydantic_model(ItemModel, source="query_args")
+async def sanic_query(request: Request, data: ItemModel) -> HTTPResponse:
+    del request
+    return get_response_json(code=Code.SUCCESS, data={"id": data.id})
+
+
+@sanic_app.get("/error")
+async def sanic_error(request: Request) -> HTTPResponse:
+    del request
+    raise RuntimeError("benchmark")
+
+
+# ---------- 用例与运行 ----------
+
+
+class Case(NamedTuple):
+    name: str
+    method: str
+    path: str
+    body: Optional[bytes] = None
+    # 用于确认用例按预期执行
+    expected_status: int = 200
+
+
+def _litestar_cases() -> List[Case]:
+    cases = [
+        Case("success_empty", "GET", "/success/empty"),
+        Case("fail", "GET", "/fail", expected_status=400),
+        Case("fail_msg", "GET", "/fail/msg", expected_status=400),
+        Case("validation_error", "POST", "/items", INVALID_BODY, 400),
+        Case("deserialize_failed", "POST", "/items", MALFORMED_BODY, 400),
+        Case("unhandled_exception", "GET", "/error", expected_status=500),
+        Case("not_found", "GET", "/not-found", expected_status=404),
+    ]
+    for size, body in REQUEST_BODIES.items():
+        cases.append(Case(f"success_{size}", "GET", f"/success/{size}"))
+        cases.append(Case(f"decode_struct_{size}", "POST", "/items", body))
+    return cases
+
+
+def _sanic_cases() -> List[Case]:
+    cases = [
+        Case("success_empty", "GET", "/success/empty"),
+        Case("fail", "GET", "/fail", expected_status=400),
+        Case("validation_error", "POST", "/items", INVALID_BODY),
+        Case("deserialize_failed", "POST", "/items", MALFORMED_BODY),
+        Case(
+            "inject_pydantic_model_query",
+            "GET",
+            "/query?id=1&name=item&score=0.5&tags=a&tags=b",
+        ),
+        Case("unhandled_exception", "GET", "/error", expected_status=500),
+    ]
+    for size, body in REQUEST_BODIES.items():
+        cases.append(Case(f"success_{size}", "GET", f"/success/{size}"))
+        cases.append(Case(f"inject_pydantic_model_{size}", "POST", "/items", body))
+    return cases
+
+
+@dataclass
+class Result:
+    framework: str
+    case: str
+    requests: int
+    rps: float
+    mean_ms: float
+    p50_ms: float
+    p99_ms: float
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))
+    return sorted_values[index]
+
+
+async def _start_lifespan(app: Any) -> Callable[[], Any]:
+    """执行 ASGI lifespan 启动流程，返回用于关闭应用的协程函数"""
+    receive_queue: Queue = Queue()
+    send_queue: Queue = Queue()
+    await receive_queue.put({"type": "lifespan.startup"})
+    task: Task = create_task(
+        app(
+            {"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}},
+            receive_queue.get,
+            send_queue.put,
+        )
+    )
+    message = await send_queue.get()
+    if message["type"] != "lifespan.startup.complete":
+        raise RuntimeError(f"应用启动失败：{message}")
+
+    async def shutdown() -> None:
+        await receive_queue.put({"type": "lifespan.shutdown"})
+        await send_queue.get()
+        await task
+
+    return shutdown
+
+
+async def _run_case(
+    client: AsyncClient, framework: str, case: Case, requests: int
+) -> Result:
+    response = await client.request(case.method, case.path, content=case.body)
+    if response.status_code != case.expected_status:
+        raise RuntimeError(
+            f"{framework} {case.name}：预期状态码 {case.expected_status}，"
+            f"实际为 {response.status_code}"
+        )
+
+    latencies: List[float] = []
+    start_time = perf_counter()
+    for _ in range(requests):
+        request_start_time = perf_counter()
+        await client.request(case.method, case.path, content=case.body)
+        latencies.append(perf_counter() - request_start_time)
+    total_time = perf_counter() - start_time
+
+    latencies.sort()
+    return Result(
+        framework=framework,
+        case=case.name,
+        requests=requests,
+        rps=round(requests / total_time, 1),
+        mean_ms=round(total_time / requests * 1000, 4),
+        p50_ms=round(_percentile(latencies, 50) * 1000, 4),
+        p99_ms=round(_percentile(latencies, 99) * 1000, 4),
+    )
+
+
+async def run_suite(requests: int, name_filter: Optional[str]) -> List[Result]:
+    results: List[Result] = []
+    for framework, app, cases in (
+        ("litestar", litestar_app, _litestar_cases()),
+        ("sanic", sanic_app, _sanic_cases()),
+    ):
+        shutdown = await _start_lifespan(app)
+        async with AsyncClient(
+            transport=ASGITransport(app=app),  # type: ignore
+            base_url="http://benchmark",
+        ) as client:
+            for case in cases:
+                if name_filter and name_filter not in f"{framework}.{case.name}":
+                    continue
+
+                result = await _run_case(client, framework, case, requests)
+                print(encode(asdict(result)).decode(), flush=True)
+                results.append(result)
+        await shutdown()
+
+    return results
+
+
+def _compare(results: List[Result], baseline_path: str, threshold: float) -> List[str]:
+    with open(baseline_path, "rb") as f:
+        baseline = {(x["framework"], x["case"]): x["rps"] for x in decode(f.read())}
+
+    regressions: List[str] = []
+    for result in results:
+        baseline_rps = baseline.get((result.framework, result.case))
+        if baseline_rps and result.rps < baseline_rps * (1 - threshold):
+            regressions.append(
+                f"{result.framework}.{result.case}："
+                f"{baseline_rps:.0f} -> {result.rps:.0f} req/s"
+            )
+
+    return regressions
+
+
+def main() -> None:
+    parser = ArgumentParser(description="sspeedup.api 基准测试套件")
+    parser.add_argument("-n", "--requests", type=int, default=2000)
+    parser.add_argument("-k", "--filter", dest="name_filter")
+    parser.add_argument("-o", "--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    # Sanic 会为每个未处理的异常输出日志
+    for name in ("sanic.root", "sanic.error", "sanic.access", "sanic.server"):
+        logging.getLogger(name).setLevel(logging.CRITICAL)
+    # 异常处理用例会产生大量相同异常，仅输出一次
+    set_error_reporter(ErrorReporter(dedup_window=3600))
+
+    results = run(run_suite(args.requests, args.name_filter))
+
+    if args.output:
+        with open(args.output, "wb") as f:
+            f.write(encode([asdict(x) for x in results]))
+
+    if args.baseline:
+        regressions = _compare(results, args.baseline, args.threshold)
+        for item in regressions:
+            print(f"性能下降：{item}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
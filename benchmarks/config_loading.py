@@ -0,0 +1,69 @@
+"""配置文件加载速度测试：每次解析 YAML 与读取 msgpack 快照缓存的对比
+
+用法：python benchmarks/config_loading.py [加载次数]
+"""
+import sys
+from os.path import join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable, Dict
+
+from msgspec import Struct
+
+from sspeedup.config import _load_config, _save_default_config
+from sspeedup.config.blocks import (
+    CONFIG_STRUCT_CONFIG,
+    AbilityWordSplitConfig,
+    DeployConfig,
+    FeishuAuthConfig,
+    FeishuBitableConfig,
+    FeishuMessageConfig,
+    LoggingConfig,
+    MongoDBConfig,
+)
+
+
+class _Config(Struct, **CONFIG_STRUCT_CONFIG):
+    version: str = "v1.0.0"
+    deploy: DeployConfig = DeployConfig()
+    db: MongoDBConfig = MongoDBConfig()
+    log: LoggingConfig = LoggingConfig()
+    feishu_auth: FeishuAuthConfig = FeishuAuthConfig()
+    feishu_bitable: FeishuBitableConfig = FeishuBitableConfig()
+    feishu_message: FeishuMessageConfig = FeishuMessageConfig()
+    word_split: AbilityWordSplitConfig = AbilityWordSplitConfig()
+
+
+def _bench(func: Callable[[], object], loads: int) -> float:
+    start_time = perf_counter()
+    for _ in range(loads):
+        func()
+    return (perf_counter() - start_time) / loads * 1_000_000
+
+
+def main(loads: int) -> None:
+    with TemporaryDirectory() as temp_dir:
+        file_name = join(temp_dir, "config.yaml")
+        _save_default_config(_Config, file_name=file_name)
+
+        # 首次加载：解析 YAML 并写入快照
+        start_time = perf_counter()
+        _load_config(_Config, file_name=file_name, snapshot_cache=True)
+        first_load_time = (perf_counter() - start_time) * 1_000_000
+
+        results: Dict[str, float] = {
+            "yaml": _bench(lambda: _load_config(_Config, file_name=file_name), loads),
+            "snapshot": _bench(
+                lambda: _load_config(_Config, file_name=file_name, snapshot_cache=True),
+                loads,
+            ),
+        }
+
+    print(f"{'first load (yaml + write)':<28}{first_load_time:>10.1f} us")
+    for name, time in results.items():
+        print(f"{name:<28}{time:>10.1f} us/load")
+    print(f"{'speedup':<28}{results['yaml'] / results['snapshot']:>10.1f} x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
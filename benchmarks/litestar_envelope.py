@@ -0,0 +1,140 @@
+"""success / fail 预编码响应体的吞吐量测试
+
+在进程内直接调用 Litestar 应用的 ASGI 接口，不经过测试客户端与 httpx，
+避免客户端自身的开销掩盖响应编码的差异。
+
+用法：python benchmarks/litestar_envelope.py [请求数]
+"""
+import sys
+from asyncio import run
+from time import perf_counter
+from typing import Any, Dict, List
+
+from litestar import Litestar, Response, get
+from litestar.status_codes import HTTP_404_NOT_FOUND
+from litestar.types import Message
+from msgspec.json import encode
+
+from sspeedup.api.code import Code, get_default_msg, is_ok
+from sspeedup.api.litestar import (
+    ResponseStruct,
+    fail,
+    response_with_encoded_data,
+    success,
+)
+
+DATA: List[Any] = [{"id": i, "name": f"item-{i}"} for i in range(20)]
+ENCODED_DATA = encode(DATA)
+
+
+def _legacy(api_code: Code, http_code: int, data: Any = None) -> Response:
+    # 优化前的实现：每次构建并编码 ResponseStruct
+    return Response(
+        ResponseStruct(
+            ok=is_ok(api_code),
+            code=api_code,
+            msg=get_default_msg(api_code),
+            data=data,
+        ),
+        status_code=http_code,
+    )
+
+
+@get("/legacy/success")
+async def legacy_success() -> Response:
+    return _legacy(Code.SUCCESS, 200)
+
+
+@get("/fast/success")
+async def fast_success() -> Response:
+    return success()
+
+
+@get("/legacy/fail")
+async def legacy_fail() -> Response:
+    return _legacy(Code.BAD_ARGUMENTS, HTTP_404_NOT_FOUND)
+
+
+@get("/fast/fail")
+async def fast_fail() -> Response:
+    return fail(http_code=HTTP_404_NOT_FOUND, api_code=Code.BAD_ARGUMENTS)
+
+
+@get("/legacy/data")
+async def legacy_data() -> Response:
+    return _legacy(Code.SUCCESS, 200, DATA)
+
+
+@get("/fast/encoded-data")
+async def fast_encoded_data() -> Response:
+    return response_with_encoded_data(data=ENCODED_DATA)
+
+
+async def _receive() -> Message:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(_: Message) -> None:
+    return None
+
+
+def _make_scope(path: str) -> Dict[str, Any]:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+        "state": {},
+    }
+
+
+async def _bench(app: Litestar, path: str, requests: int) -> float:
+    start_time = perf_counter()
+    for _ in range(requests):
+        # scope 在请求处理过程中会被修改，每次请求使用新的 scope
+        await app(_make_scope(path), _receive, _send)  # type: ignore
+    return requests / (perf_counter() - start_time)
+
+
+async def main(requests: int) -> None:
+    app = Litestar(
+        [
+            legacy_success,
+            fast_success,
+            legacy_fail,
+            fast_fail,
+            legacy_data,
+            fast_encoded_data,
+        ]
+    )
+    paths: List[str] = [
+        "/legacy/success",
+        "/fast/success",
+        "/legacy/fail",
+        "/fast/fail",
+        "/legacy/data",
+        "/fast/encoded-data",
+    ]
+
+    # 预热后交替运行多轮并取最优值，降低波动的影响
+    for path in paths:
+        await _bench(app, path, 100)
+    results = {path: 0.0 for path in paths}
+    for _ in range(5):
+        for path in paths:
+            results[path] = max(results[path], await _bench(app, path, requests))
+
+    for path, rps in results.items():
+        print(f"{path:<24}{rps:>10.0f} req/s")
+
+
+if __name__ == "__main__":
+    run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
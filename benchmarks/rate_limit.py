@@ -0,0 +1,64 @@
+"""限流检查为每个请求增加的开销
+
+用法：python benchmarks/rate_limit.py [调用次数]
+"""
+import sys
+from asyncio import run
+from time import perf_counter
+from typing import Dict
+
+from sanic import Request, Sanic
+from sanic.compat import Header
+
+from sspeedup.api.rate_limit import MemoryRateLimitBackend, RateLimiter, RateLimitRule
+from sspeedup.api.rate_limit.sanic import create_rate_limit_middleware
+
+RULES: Dict[str, RateLimitRule] = {
+    "token_bucket": RateLimitRule(scope="ip", limit=100, period=1),
+    "sliding_window": RateLimitRule(
+        scope="ip", limit=100, period=1, algorithm="sliding_window"
+    ),
+}
+
+app = Sanic("sspeedup-benchmark")
+
+
+async def _bench_check(rule: RateLimitRule, calls: int, ips: int) -> float:
+    limiter = RateLimiter([rule], backend=MemoryRateLimitBackend())
+    ip_list = [f"10.0.{i // 256}.{i % 256}" for i in range(ips)]
+
+    start_time = perf_counter()
+    for i in range(calls):
+        await limiter.check(ip=ip_list[i % ips])
+    return (perf_counter() - start_time) / calls * 1e6
+
+
+async def _bench_sanic_middleware(rule: RateLimitRule, calls: int) -> float:
+    # 测试用请求没有客户端 IP，故使用全局规则
+    # 绝大多数请求会被限流，结果包含构建限流响应的开销
+    global_rule = RateLimitRule(
+        scope="global", limit=rule.limit, period=rule.period, algorithm=rule.algorithm
+    )
+    middleware = create_rate_limit_middleware(
+        RateLimiter([global_rule], backend=MemoryRateLimitBackend())
+    )
+    request = Request(b"/", Header({}), "1.1", "GET", None, app)  # type: ignore
+
+    start_time = perf_counter()
+    for _ in range(calls):
+        await middleware(request)
+    return (perf_counter() - start_time) / calls * 1e6
+
+
+async def main(calls: int) -> None:
+    for name, rule in RULES.items():
+        for ips in (1, 10000):
+            cost = await _bench_check(rule, calls, ips)
+            print(f"check     {name:<16}{ips:>6} IP {cost:>8.2f} μs")
+
+        cost = await _bench_sanic_middleware(rule, calls)
+        print(f"sanic     {name:<16}{'':>9} {cost:>8.2f} μs")
+
+
+if __name__ == "__main__":
+    run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000))
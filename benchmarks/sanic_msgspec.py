@@ -0,0 +1,84 @@
+"""Sanic 集成中 pydantic + ujson 与 msgspec 两种实现的对比测试
+
+直接以 Sanic Request 对象调用被装饰的处理函数，测量校验与响应编码的开销。
+
+用法：python benchmarks/sanic_msgspec.py [调用次数]
+"""
+import sys
+from asyncio import run
+from time import perf_counter
+from typing import Any, Callable, Dict, List
+
+from msgspec import Struct
+from sanic import HTTPResponse, Request, Sanic
+from sanic.compat import Header
+
+from sspeedup.api.code import Code
+from sspeedup.api.sanic import BaseModel, get_response_json, inject_pydantic_model
+from sspeedup.api.sanic_msgspec import REQUEST_STRUCT_CONFIG, inject_struct
+from sspeedup.api.sanic_msgspec import get_response_json as get_response_json_msgspec
+
+
+class ItemModel(BaseModel):
+    name: str
+    count: int
+    tags: List[str]
+
+
+class ItemStruct(Struct, **REQUEST_STRUCT_CONFIG):
+    name: str
+    count: int
+    tags: List[str]
+
+
+DATA = {"items": [{"id": i, "name": f"item-{i}"} for i in range(20)]}
+
+BODIES: Dict[str, bytes] = {
+    "valid": b'{"name": "test", "count": 1, "tags": ["a", "b", "c"]}',
+    "invalid": b'{"name": "test", "count": "x", "tags": []}',
+    "malformed": b'{"name": "test", ',
+}
+
+app = Sanic("sspeedup-benchmark")
+
+
+@inject_pydantic_model(ItemModel)
+def pydantic_handler(request: Request, data: ItemModel) -> HTTPResponse:
+    del request, data
+    return get_response_json(code=Code.SUCCESS, data=DATA)
+
+
+@inject_struct(ItemStruct)
+def msgspec_handler(request: Request, data: ItemStruct) -> HTTPResponse:
+    del request, data
+    return get_response_json_msgspec(code=Code.SUCCESS, data=DATA)
+
+
+def _make_request(body: bytes) -> Request:
+    request = Request(b"/", Header({}), "1.1", "POST", None, app)  # type: ignore
+    request.body = body
+    return request
+
+
+async def _bench(handler: Callable[[Request], Any], body: bytes, calls: int) -> float:
+    request = _make_request(body)
+
+    start_time = perf_counter()
+    for _ in range(calls):
+        result = handler(request)
+        if not isinstance(result, HTTPResponse):
+            await result
+    return calls / (perf_counter() - start_time)
+
+
+async def main(calls: int) -> None:
+    handlers = {"pydantic + ujson": pydantic_handler, "msgspec": msgspec_handler}
+
+    for body_name, body in BODIES.items():
+        for handler_name, handler in handlers.items():
+            ops = max([await _bench(handler, body, calls) for _ in range(3)])
+            print(f"{body_name:<10}{handler_name:<18}{ops:>12.0f} ops/s")
+
+
+if __name__ == "__main__":
+    run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
@@ -0,0 +1,68 @@
+from typing import Any, Dict, Optional
+
+from msgspec import Struct
+from msgspec.json import Encoder
+
+from sspeedup.api.code import Code, get_default_msg, is_ok
+
+REQUEST_STRUCT_CONFIG: Dict[str, Any] = {
+    "frozen": True,
+    "kw_only": True,
+    "forbid_unknown_fields": True,
+    "rename": "camel",
+}
+
+RESPONSE_STRUCT_CONFIG: Dict[str, Any] = {
+    "kw_only": True,
+    "rename": "camel",
+}
+
+
+class _ResponseStruct(Struct, frozen=True, kw_only=True):
+    ok: bool
+    code: int
+    msg: str
+    data: Any
+
+
+class _EnvelopeHeader(Struct, frozen=True, kw_only=True):
+    # 与 _ResponseStruct 字段顺序一致，不含 data 字段，用于流式响应
+    ok: bool
+    code: int
+    msg: str
+
+
+_ENCODER = Encoder()
+
+# 无数据且使用默认信息的响应体，按错误码预先编码
+ENCODED_EMPTY_BODIES: Dict[Code, bytes] = {
+    code: _ENCODER.encode(
+        _ResponseStruct(ok=is_ok(code), code=code, msg=get_default_msg(code), data=None)
+    )
+    for code in Code
+}
+
+
+def encode_envelope(api_code: Code, msg: Optional[str], data: Any) -> bytes:
+    """编码统一格式的响应体，data 为 msgspec.Raw 时直接嵌入，不再重复编码"""
+    if data is None and not msg:
+        return ENCODED_EMPTY_BODIES[api_code]
+
+    return _ENCODER.encode(
+        _ResponseStruct(
+            ok=is_ok(api_code),
+            code=api_code,
+            msg=msg if msg else get_default_msg(api_code),
+            data=data,
+        )
+    )
+
+
+def encode_envelope_header(api_code: Code, msg: Optional[str]) -> bytes:
+    return _ENCODER.encode(
+        _EnvelopeHeader(
+            ok=is_ok(api_code),
+            code=api_code,
+            msg=msg if msg else get_default_msg(api_code),
+        )
+    )
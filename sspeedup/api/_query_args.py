@@ -0,0 +1,25 @@
+import types
+from typing import Any, Dict, List, Set, Union, get_args, get_origin
+
+_SEQUENCE_ORIGINS = (list, tuple, set, frozenset)
+# Python 3.10 起 list[int] | None 的 origin 为 types.UnionType
+_UNION_ORIGINS = tuple(
+    x for x in (Union, getattr(types, "UnionType", None)) if x is not None
+)
+
+
+def is_sequence_annotation(annotation: Any) -> bool:
+    origin = get_origin(annotation)
+    if origin in _UNION_ORIGINS:  # Optional[List[...]]、list[int] | None 等
+        return any(is_sequence_annotation(x) for x in get_args(annotation))
+
+    return origin in _SEQUENCE_ORIGINS or annotation in _SEQUENCE_ORIGINS
+
+
+def parse_query_args(
+    args: Dict[str, List[str]], sequence_keys: Set[str]
+) -> Dict[str, Any]:
+    # 在 Query Args 规范中，每个 key 可以有多个 value
+    # 故 request.args 返回的是 Dict[str, List[Any]] 形式的数据
+    # 对于列表类型的字段，保留全部 value，其余字段仅保留第一个 value
+    return {k: v if k in sequence_keys else v[0] for k, v in args.items()}
@@ -0,0 +1 @@
+from sspeedup.api.batch._base import BatchRunner, BatchSubRequest
@@ -0,0 +1,143 @@
+from asyncio import Semaphore, gather
+from typing import Any, Awaitable, Callable, List, Literal, Optional, Tuple
+
+from msgspec import UNSET, DecodeError, Raw, Struct, UnsetType, ValidationError
+from msgspec.json import Decoder, Encoder
+
+from sspeedup.api._msgspec import encode_envelope
+from sspeedup.api.code import Code
+
+HttpMethod = Literal["GET", "POST", "PUT", "PATCH", "DELETE"]
+
+# 子请求的响应：HTTP 状态码、Content-Type、响应体
+SubResponse = Tuple[int, str, bytes]
+
+_ENCODER = Encoder()
+
+# 子请求的 scope（Litestar）或 request.ctx（Sanic）中带有该标记
+SUB_REQUEST_FLAG = "sspeedup_batch_sub_request"
+
+
+class BatchSubRequest(Struct, frozen=True, kw_only=True, forbid_unknown_fields=True):
+    method: HttpMethod = "POST"
+    # 可包含查询参数
+    path: str
+    # 未设置时子请求不携带请求体
+    body: Any = UNSET
+
+    def encode_body(self) -> bytes:
+        if isinstance(self.body, UnsetType):
+            return b""
+
+        return _ENCODER.encode(self.body)
+
+
+_DECODER = Decoder(List[BatchSubRequest])
+
+_ENVELOPE_START = b'{"ok":'
+
+
+def _error_envelope(api_code: Code, msg: Optional[str] = None) -> bytes:
+    return encode_envelope(api_code, msg, None)
+
+
+def _to_envelope(response: SubResponse) -> bytes:
+    status, content_type, body = response
+    if content_type.startswith("application/json") and body.startswith(_ENVELOPE_START):
+        return body
+
+    # 未使用统一响应格式的响应，如路由不存在时的空响应
+    if status == 404:
+        return _error_envelope(Code.BAD_ARGUMENTS, "接口不存在")
+    if status == 405:
+        return _error_envelope(Code.BAD_ARGUMENTS, "接口不支持该请求方法")
+    if status < 400:
+        return _error_envelope(Code.SERIALIZE_FAILED, "批量请求仅支持 JSON 响应")
+    if status < 500:
+        return _error_envelope(Code.BAD_ARGUMENTS)
+    return _error_envelope(Code.UNKNOWN_SERVER_ERROR)
+
+
+def wrap_success(data: bytes) -> bytes:
+    """将编码后的子请求响应数组放入成功响应的 data 字段"""
+    return encode_envelope(Code.SUCCESS, None, Raw(data))
+
+
+class BatchRunner:
+    """解析批量请求，并发执行子请求，返回由各子请求响应组成的数组"""
+
+    def __init__(self, *, concurrency: int = 8, max_requests: int = 20) -> None:
+        """
+        Args:
+            concurrency (int, optional): 单个批量请求中同时执行的子请求数.
+                Defaults to 8.
+            max_requests (int, optional): 单个批量请求中的子请求数上限. Defaults to 20.
+        """
+        if concurrency <= 0:
+            raise ValueError("concurrency 必须大于 0")
+        if max_requests <= 0:
+            raise ValueError("max_requests 必须大于 0")
+
+        self._concurrency = concurrency
+        self._max_requests = max_requests
+
+    def parse(
+        self, body: bytes, *, is_sub_request: bool = False
+    ) -> Tuple[Optional[List[BatchSubRequest]], bytes]:
+        """解析批量请求
+
+        Args:
+            body (bytes): 请求体
+            is_sub_request (bool, optional): 该请求本身是否为子请求，
+                为 True 时直接拒绝，避免嵌套执行批量请求. Defaults to False.
+
+        Returns:
+            Tuple[Optional[List[BatchSubRequest]], bytes]: 子请求列表，
+                解析失败时为 None，此时第二项为编码后的错误响应体
+        """
+        # 根据请求标记而非路径判断，路由别名或末尾的 / 同样无法绕过
+        if is_sub_request:
+            return None, _error_envelope(
+                Code.BAD_ARGUMENTS, "子请求不能指向批量请求接口"
+            )
+
+        try:
+            sub_requests = _DECODER.decode(body)
+        # ValidationError 是 DecodeError 的子类，需先行处理
+        except ValidationError as e:
+            return None, _error_envelope(Code.BAD_ARGUMENTS, f"数据校验失败：\n{e}")
+        except DecodeError:
+            return None, _error_envelope(Code.DESERIALIZE_FAILED)
+
+        if not sub_requests:
+            return None, _error_envelope(Code.BAD_ARGUMENTS, "子请求列表不能为空")
+        if len(sub_requests) > self._max_requests:
+            return None, _error_envelope(
+                Code.BAD_ARGUMENTS, f"子请求数不能超过 {self._max_requests}"
+            )
+        for item in sub_requests:
+            if not item.path.startswith("/"):
+                return None, _error_envelope(
+                    Code.BAD_ARGUMENTS, "子请求路径必须以 / 开头"
+                )
+
+        return sub_requests, b""
+
+    async def run(
+        self,
+        sub_requests: List[BatchSubRequest],
+        call: Callable[[BatchSubRequest], Awaitable[SubResponse]],
+    ) -> bytes:
+        """并发执行子请求，结果顺序与子请求顺序一致
+
+        Returns:
+            bytes: 编码后的 JSON 数组，每一项为一个子请求的响应体
+        """
+        semaphore = Semaphore(self._concurrency)
+
+        async def run_one(sub_request: BatchSubRequest) -> bytes:
+            async with semaphore:
+                return _to_envelope(await call(sub_request))
+
+        results = await gather(*(run_one(x) for x in sub_requests))
+        return b"[" + b",".join(results) + b"]"
@@ -0,0 +1,127 @@
+from typing import Any, List, Tuple
+
+from litestar import MediaType, Request, Response, post
+from litestar.handlers import HTTPRouteHandler
+from litestar.status_codes import HTTP_200_OK, HTTP_400_BAD_REQUEST
+from litestar.types import Message, Scope
+
+from sspeedup.api.batch._base import (
+    SUB_REQUEST_FLAG,
+    BatchRunner,
+    BatchSubRequest,
+    SubResponse,
+)
+from sspeedup.api.litestar import ResponseStruct, response_with_encoded_data
+
+# 子请求不继承这些请求头
+_SKIP_REQUEST_HEADERS = {
+    b"content-length",
+    b"content-type",
+    b"accept-encoding",
+    b"if-none-match",
+}
+
+_INHERITED_SCOPE_KEYS = (
+    "asgi",
+    "http_version",
+    "scheme",
+    "root_path",
+    "client",
+    "server",
+    "extensions",
+)
+
+
+async def _call_app(request: Request, sub_request: BatchSubRequest) -> SubResponse:
+    path, _, query_string = sub_request.path.partition("?")
+    body = sub_request.encode_body()
+
+    headers: List[Tuple[bytes, bytes]] = [
+        (key, value)
+        for key, value in request.scope["headers"]
+        if key not in _SKIP_REQUEST_HEADERS
+    ]
+    if body:
+        headers.append((b"content-type", b"application/json"))
+        headers.append((b"content-length", str(len(body)).encode()))
+
+    # 仅继承 ASGI 规范中的字段，Litestar 会在处理过程中向 scope 写入自身的状态
+    scope: Scope = {  # type: ignore
+        **{
+            key: request.scope[key]  # type: ignore
+            for key in _INHERITED_SCOPE_KEYS
+            if key in request.scope
+        },
+        "type": "http",
+        "method": sub_request.method,
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query_string.encode(),
+        "headers": headers,
+        "state": {},
+        SUB_REQUEST_FLAG: True,
+    }
+
+    body_sent = False
+
+    async def receive() -> Message:
+        nonlocal body_sent
+
+        if body_sent:
+            return {"type": "http.disconnect"}
+        body_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    status = 500
+    content_type = ""
+    chunks: List[bytes] = []
+
+    async def send(message: Message) -> None:
+        nonlocal status, content_type
+
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            for key, value in message["headers"]:
+                if key.lower() == b"content-type":
+                    content_type = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await request.app(scope, receive, send)  # type: ignore
+    return status, content_type, b"".join(chunks)
+
+
+def create_batch_route(
+    path: str = "/batch", *, concurrency: int = 8, max_requests: int = 20
+) -> HTTPRouteHandler:
+    """创建批量请求路由，传入 Litestar 的 route_handlers 参数
+
+    请求体为子请求数组，每个子请求包含 method、path 与可选的 body，
+    子请求经过完整的中间件与路由处理，并发数受 concurrency 限制。
+    响应的 data 为各子请求的响应，顺序与子请求一致。
+
+    Args:
+        path (str, optional): 路由路径. Defaults to "/batch".
+        concurrency (int, optional): 单个批量请求中同时执行的子请求数.
+            Defaults to 8.
+        max_requests (int, optional): 单个批量请求中的子请求数上限. Defaults to 20.
+    """
+    runner = BatchRunner(concurrency=concurrency, max_requests=max_requests)
+
+    @post(path, status_code=HTTP_200_OK)
+    async def batch_handler(request: Request) -> Response[ResponseStruct[Any]]:
+        sub_requests, error = runner.parse(
+            await request.body(),
+            is_sub_request=request.scope.get(SUB_REQUEST_FLAG, False),  # type: ignore
+        )
+        if sub_requests is None:
+            return Response(
+                error, status_code=HTTP_400_BAD_REQUEST, media_type=MediaType.JSON
+            )
+
+        async def call(sub_request: BatchSubRequest) -> SubResponse:
+            return await _call_app(request, sub_request)
+
+        return response_with_encoded_data(data=await runner.run(sub_requests, call))
+
+    return batch_handler
@@ -0,0 +1,132 @@
+from typing import List, Optional
+
+from sanic import HTTPResponse, Request, Sanic
+from sanic.compat import Header
+from sanic.http import Stage
+from sanic.response import BaseHTTPResponse
+
+from sspeedup.api.batch._base import (
+    SUB_REQUEST_FLAG,
+    BatchRunner,
+    BatchSubRequest,
+    SubResponse,
+    wrap_success,
+)
+from sspeedup.api.error_reporter import get_error_reporter
+
+_HTTP_400_BAD_REQUEST = 400
+_HTTP_500_INTERNAL_SERVER_ERROR = 500
+
+# 子请求不继承这些请求头
+_SKIP_REQUEST_HEADERS = {
+    "content-length",
+    "content-type",
+    "accept-encoding",
+    "if-none-match",
+}
+
+
+class _CaptureStream:
+    """代替连接的响应流，收集子请求的响应而不写入连接"""
+
+    request_body = None
+    # 始终处于处理阶段，异常处理时可以替换为错误响应
+    stage = Stage.HANDLER
+
+    def __init__(self) -> None:
+        self.response: Optional[BaseHTTPResponse] = None
+        self.chunks: List[bytes] = []
+
+    def respond(self, response: BaseHTTPResponse) -> BaseHTTPResponse:
+        response.stream = self  # type: ignore
+        self.response = response
+        return response
+
+    async def send(self, data: bytes, end_stream: bool) -> None:
+        del end_stream
+        if data:
+            self.chunks.append(data)
+
+
+async def _call_handler(request: Request, sub_request: BatchSubRequest) -> SubResponse:
+    body = sub_request.encode_body()
+
+    headers = Header(
+        [
+            (key, value)
+            for key, value in request.headers.items()
+            if key.lower() not in _SKIP_REQUEST_HEADERS
+        ]
+    )
+    if body:
+        headers["content-type"] = "application/json"
+        headers["content-length"] = str(len(body))
+
+    stream = _CaptureStream()
+    sub = Request(
+        sub_request.path.encode(),
+        headers,
+        request.version,
+        sub_request.method,
+        request.transport,
+        request.app,
+    )
+    sub.body = body
+    sub.conn_info = request.conn_info
+    sub.stream = stream  # type: ignore
+    setattr(sub.ctx, SUB_REQUEST_FLAG, True)
+
+    # 与普通请求相同，经过路由、中间件、信号与异常处理
+    try:
+        await request.app.handle_request(sub)
+    except Exception as e:
+        get_error_reporter().report(e)
+        return _HTTP_500_INTERNAL_SERVER_ERROR, "", b""
+
+    response = stream.response
+    if response is None:
+        return _HTTP_500_INTERNAL_SERVER_ERROR, "", b""
+
+    return (
+        response.status,
+        response.content_type or "",
+        (response.body or b"") + b"".join(stream.chunks),
+    )
+
+
+def setup_batch(
+    app: Sanic, uri: str = "/batch", *, concurrency: int = 8, max_requests: int = 20
+) -> None:
+    """为应用注册批量请求路由
+
+    请求体为子请求数组，每个子请求包含 method、path 与可选的 body，
+    子请求经过完整的路由、中间件与异常处理，并发数受 concurrency 限制。
+    响应的 data 为各子请求的响应，顺序与子请求一致。
+
+    Args:
+        app (Sanic): Sanic 应用
+        uri (str, optional): 路由路径. Defaults to "/batch".
+        concurrency (int, optional): 单个批量请求中同时执行的子请求数.
+            Defaults to 8.
+        max_requests (int, optional): 单个批量请求中的子请求数上限. Defaults to 20.
+    """
+    runner = BatchRunner(concurrency=concurrency, max_requests=max_requests)
+
+    async def batch_handler(request: Request) -> HTTPResponse:
+        sub_requests, error = runner.parse(
+            request.body, is_sub_request=getattr(request.ctx, SUB_REQUEST_FLAG, False)
+        )
+        if sub_requests is None:
+            return HTTPResponse(
+                error, status=_HTTP_400_BAD_REQUEST, content_type="application/json"
+            )
+
+        async def call(sub_request: BatchSubRequest) -> SubResponse:
+            return await _call_handler(request, sub_request)
+
+        return HTTPResponse(
+            wrap_success(await runner.run(sub_requests, call)),
+            content_type="application/json",
+        )
+
+    app.add_route(batch_handler, uri, methods=["POST"], name="sspeedup_batch")
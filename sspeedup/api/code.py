@@ -1,4 +1,5 @@
 from enum import Enum, IntEnum
+from typing import Dict
 
 
 class Code(IntEnum):
@@ -77,5 +78,8 @@ def is_ok(code: Code) -> bool:
     return code == 0 or 100 <= code <= 199
 
 
+_CODE_TO_DEFAULT_MSG: Dict[Code, str] = {code: Msg[code.name].value for code in Code}
+
+
 def get_default_msg(code: Code) -> str:
-    return Msg[code.name].value
+    return _CODE_TO_DEFAULT_MSG[code]
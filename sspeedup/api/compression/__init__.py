@@ -0,0 +1,7 @@
+from sspeedup.api.compression._base import (
+    Compressor,
+    Encoding,
+    Preset,
+    is_zstd_available,
+    merge_vary,
+)
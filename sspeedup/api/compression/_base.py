@@ -0,0 +1,132 @@
+from asyncio import get_running_loop
+from functools import lru_cache
+from gzip import compress as gzip_compress
+from typing import Dict, Literal, Optional, Sequence, Tuple
+
+try:
+    from zstandard import ZstdCompressor
+except ImportError:  # zstd 为可选依赖
+    ZstdCompressor = None
+
+Encoding = Literal["zstd", "gzip"]
+Preset = Literal["fast", "balanced", "best"]
+
+_PRESET_LEVELS: Dict[Preset, Dict[Encoding, int]] = {
+    "fast": {"zstd": 1, "gzip": 1},
+    "balanced": {"zstd": 3, "gzip": 6},
+    "best": {"zstd": 19, "gzip": 9},
+}
+
+_COMPRESSIBLE_CONTENT_TYPE_PREFIXES: Tuple[str, ...] = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+
+
+def is_zstd_available() -> bool:
+    return ZstdCompressor is not None
+
+
+def merge_vary(vary: Optional[str]) -> str:
+    """在原有的 Vary 响应头中追加 Accept-Encoding"""
+    if not vary:
+        return "Accept-Encoding"
+
+    items = {x.strip().lower() for x in vary.split(",")}
+    if "accept-encoding" in items or "*" in items:
+        return vary
+
+    return f"{vary}, Accept-Encoding"
+
+
+@lru_cache(maxsize=256)
+def _parse_accept_encoding(accept_encoding: str) -> Dict[str, float]:
+    result: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        result[name] = quality
+
+    return result
+
+
+class Compressor:
+    def __init__(
+        self,
+        *,
+        min_size: int = 1024,
+        preset: Preset = "balanced",
+        encodings: Sequence[Encoding] = ("zstd", "gzip"),
+        offload_size: int = 64 * 1024,
+    ) -> None:
+        """
+        Args:
+            min_size (int, optional): 响应体小于该值（字节）时不压缩. Defaults to 1024.
+            preset (Preset, optional): 压缩等级预设. Defaults to "balanced".
+            encodings (Sequence[Encoding], optional): 支持的压缩算法，按优先级排列，
+                未安装 zstandard 时自动忽略 zstd. Defaults to ("zstd", "gzip").
+            offload_size (int, optional): 响应体不小于该值（字节）时在线程池中压缩，
+                避免阻塞事件循环. Defaults to 64 * 1024.
+        """
+        if min_size < 0:
+            raise ValueError("min_size 不能小于 0")
+        if offload_size < 0:
+            raise ValueError("offload_size 不能小于 0")
+
+        self._min_size = min_size
+        self._offload_size = offload_size
+        self._levels = _PRESET_LEVELS[preset]
+        self._encodings = tuple(
+            x for x in encodings if x != "zstd" or is_zstd_available()
+        )
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Optional[Encoding]:
+        """根据 Accept-Encoding 请求头选择压缩算法，不压缩时返回 None"""
+        if not accept_encoding:
+            return None
+
+        accepted = _parse_accept_encoding(accept_encoding)
+        wildcard_quality = accepted.get("*", 0)
+        for encoding in self._encodings:
+            if accepted.get(encoding, wildcard_quality) > 0:
+                return encoding
+
+        return None
+
+    def should_compress(self, body: bytes, content_type: Optional[str]) -> bool:
+        if len(body) < self._min_size:
+            return False
+
+        return bool(content_type) and content_type.startswith(  # type: ignore
+            _COMPRESSIBLE_CONTENT_TYPE_PREFIXES
+        )
+
+    def compress(self, body: bytes, encoding: Encoding) -> bytes:
+        if encoding == "zstd":
+            # ZstdCompressor 不能在多个线程中同时使用，每次创建新对象
+            return ZstdCompressor(level=self._levels["zstd"]).compress(body)  # type: ignore
+
+        return gzip_compress(body, compresslevel=self._levels["gzip"], mtime=0)
+
+    async def compress_async(self, body: bytes, encoding: Encoding) -> bytes:
+        """在事件循环中压缩，较大的响应体在线程池中压缩"""
+        if len(body) < self._offload_size:
+            return self.compress(body, encoding)
+
+        # gzip 与 zstd 压缩时会释放 GIL，不会阻塞其它线程
+        return await get_running_loop().run_in_executor(
+            None, self.compress, body, encoding
+        )
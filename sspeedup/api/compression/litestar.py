@@ -0,0 +1,101 @@
+from typing import Callable, List, Optional, Tuple
+
+from litestar.enums import ScopeType
+from litestar.types import ASGIApp, Message, Receive, Scope, Send
+
+from sspeedup.api.compression._base import Compressor, merge_vary
+
+_SKIP_RESPONSE_HEADERS = {b"content-length", b"content-encoding", b"vary", b"etag"}
+
+
+def _get_header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[str]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+
+    return None
+
+
+def create_compression_middleware(
+    compressor: Compressor,
+) -> Callable[[ASGIApp], ASGIApp]:
+    """创建响应压缩中间件，可传入应用或路由的 middleware 参数
+
+    仅压缩未使用流式传输、未设置 Content-Encoding 且大小超过阈值的响应，
+    压缩后的响应会移除原有的 ETag 响应头，并在 Vary 响应头中追加 Accept-Encoding。
+
+    需要缓存压缩结果时，请为响应缓存中间件传入 compressor 参数，
+    其返回的响应已设置 Content-Encoding，不会被重复压缩。
+
+    Args:
+        compressor (Compressor): 压缩器
+    """
+
+    def middleware_factory(app: ASGIApp) -> ASGIApp:
+        async def middleware(scope: Scope, receive: Receive, send: Send) -> None:
+            if scope["type"] != ScopeType.HTTP:
+                await app(scope, receive, send)
+                return
+
+            encoding = compressor.negotiate(
+                _get_header(scope["headers"], b"accept-encoding")
+            )
+            if not encoding:
+                await app(scope, receive, send)
+                return
+
+            start_message: Optional[Message] = None
+            passthrough = False
+
+            async def compress_send(message: Message) -> None:
+                nonlocal start_message, passthrough
+
+                if passthrough:
+                    await send(message)
+                    return
+
+                if message["type"] == "http.response.start":
+                    if _get_header(message["headers"], b"content-encoding"):
+                        passthrough = True
+                        await send(message)
+                    else:
+                        start_message = message
+                    return
+
+                if message["type"] != "http.response.body" or start_message is None:
+                    await send(message)
+                    return
+
+                # 流式响应不压缩
+                passthrough = True
+                body = message.get("body", b"")
+                headers = start_message["headers"]
+                if message.get("more_body", False) or not compressor.should_compress(
+                    body, _get_header(headers, b"content-type")
+                ):
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                body = await compressor.compress_async(body, encoding)
+                new_headers = [
+                    (key, value)
+                    for key, value in headers
+                    if key.lower() not in _SKIP_RESPONSE_HEADERS
+                ]
+                vary = ", ".join(
+                    value.decode("latin-1")
+                    for key, value in headers
+                    if key.lower() == b"vary"
+                )
+                new_headers.append((b"content-encoding", encoding.encode()))
+                new_headers.append((b"content-length", str(len(body)).encode()))
+                new_headers.append((b"vary", merge_vary(vary).encode("latin-1")))
+                await send({**start_message, "headers": new_headers})
+                await send({"type": "http.response.body", "body": body})
+
+            await app(scope, receive, compress_send)
+
+        return middleware
+
+    return middleware_factory
@@ -0,0 +1,38 @@
+from sanic import HTTPResponse, Request, Sanic
+
+from sspeedup.api.compression._base import Compressor, merge_vary
+
+
+def setup_compression(app: Sanic, compressor: Compressor) -> None:
+    """为应用注册响应压缩中间件
+
+    仅压缩未设置 Content-Encoding 且大小超过阈值的响应，流式响应不会被压缩，
+    压缩后的响应会移除原有的 ETag 响应头，并在 Vary 响应头中追加 Accept-Encoding。
+
+    需要缓存压缩结果时，请为 cache_response 传入 compressor 参数，
+    其返回的响应已设置 Content-Encoding，不会被重复压缩。
+
+    Args:
+        app (Sanic): Sanic 应用
+        compressor (Compressor): 压缩器
+    """
+
+    async def compress_response(request: Request, response: HTTPResponse) -> None:
+        # 流式响应的 body 为 None
+        if not response.body or "Content-Encoding" in response.headers:
+            return
+
+        encoding = compressor.negotiate(request.headers.get("Accept-Encoding"))
+        if not encoding or not compressor.should_compress(
+            response.body, response.content_type
+        ):
+            return
+
+        response.body = await compressor.compress_async(response.body, encoding)
+        response.headers.pop("ETag", None)
+        response.headers["Content-Encoding"] = encoding
+        response.headers["Vary"] = merge_vary(
+            ", ".join(response.headers.getall("Vary", []))
+        )
+
+    app.register_middleware(compress_response, "response")
@@ -0,0 +1,170 @@
+from atexit import register as atexit_register
+from collections import deque
+from dataclasses import dataclass
+from hashlib import blake2b
+from sys import stderr
+from threading import Event, Lock, Thread
+from time import monotonic
+from traceback import print_exception, walk_tb
+from typing import TYPE_CHECKING, Deque, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from sspeedup.logging.run_logger import RunLogger
+
+
+def get_fingerprint(exception: BaseException) -> str:
+    """以异常类型与抛出位置生成指纹，异常信息不同但来源相同的异常指纹相同"""
+    parts = [f"{type(exception).__module__}.{type(exception).__qualname__}"]
+    for frame, line in walk_tb(exception.__traceback__):
+        parts.append(f"{frame.f_code.co_filename}:{line}")
+
+    return blake2b("|".join(parts).encode(), digest_size=8).hexdigest()
+
+
+@dataclass
+class _FingerprintState:
+    last_report_time: float
+    # 上次上报后被去重的次数
+    suppressed: int = 0
+
+
+class ErrorReporter:
+    """在后台线程中输出异常信息，同一指纹的异常在去重窗口内仅输出一次
+
+    report 仅将异常放入队列，不会在调用方线程中格式化或输出堆栈。
+    """
+
+    def __init__(
+        self,
+        *,
+        logger: Optional["RunLogger"] = None,
+        dedup_window: float = 60,
+        interval: float = 1,
+        max_reports_per_interval: int = 10,
+        max_pending: int = 1000,
+        max_fingerprints: int = 10000,
+    ) -> None:
+        """
+        Args:
+            logger (Optional[RunLogger], optional): 运行日志记录器，为空时输出到
+                stderr. Defaults to None.
+            dedup_window (float, optional): 去重窗口（秒）. Defaults to 60.
+            interval (float, optional): 输出间隔（秒）. Defaults to 1.
+            max_reports_per_interval (int, optional): 每个输出间隔内最多输出的异常数，
+                超出部分留到下一间隔. Defaults to 10.
+            max_pending (int, optional): 队列长度上限，超出时丢弃最早的异常.
+                Defaults to 1000.
+            max_fingerprints (int, optional): 记录的指纹数上限，超出时清空.
+                Defaults to 10000.
+        """
+        if dedup_window < 0:
+            raise ValueError("dedup_window 不能小于 0")
+        if interval <= 0:
+            raise ValueError("interval 必须大于 0")
+        if max_reports_per_interval <= 0:
+            raise ValueError("max_reports_per_interval 必须大于 0")
+        if max_pending <= 0:
+            raise ValueError("max_pending 必须大于 0")
+        if max_fingerprints <= 0:
+            raise ValueError("max_fingerprints 必须大于 0")
+
+        self._logger = logger
+        self._dedup_window = dedup_window
+        self._interval = interval
+        self._max_reports_per_interval = max_reports_per_interval
+        self._max_fingerprints = max_fingerprints
+
+        # (指纹, 异常, 此前被去重的次数)
+        self._pending: Deque[Tuple[str, BaseException, int]] = deque(maxlen=max_pending)
+        self._fingerprints: Dict[str, _FingerprintState] = {}
+        self._lock = Lock()
+
+        self._thread: Optional[Thread] = None
+        self._stop_event = Event()
+
+    def report(self, exception: BaseException) -> None:
+        fingerprint = get_fingerprint(exception)
+        now = monotonic()
+
+        with self._lock:
+            state = self._fingerprints.get(fingerprint)
+            if state and now - state.last_report_time < self._dedup_window:
+                state.suppressed += 1
+                return
+
+            if not state and len(self._fingerprints) >= self._max_fingerprints:
+                self._fingerprints.clear()
+
+            suppressed = state.suppressed if state else 0
+            self._fingerprints[fingerprint] = _FingerprintState(last_report_time=now)
+            self._pending.append((fingerprint, exception, suppressed))
+
+            if not self._thread:
+                self._thread = Thread(
+                    target=self._loop, name="error-reporter", daemon=True
+                )
+                self._thread.start()
+
+    def _output(
+        self, fingerprint: str, exception: BaseException, suppressed: int
+    ) -> None:
+        if self._logger:
+            self._logger.error(
+                "未处理的异常",
+                exception=exception,  # type: ignore
+                fingerprint=fingerprint,
+                suppressed=suppressed,
+            )
+            return
+
+        if suppressed:
+            print(
+                f"[{fingerprint}] 上一去重窗口内另有 {suppressed} 次相同异常",
+                file=stderr,
+            )
+        print_exception(type(exception), exception, exception.__traceback__)
+
+    def flush(self, *, limit: Optional[int] = None) -> int:
+        """输出队列中的异常
+
+        Returns:
+            int: 输出的异常数
+        """
+        count = 0
+        while limit is None or count < limit:
+            with self._lock:
+                if not self._pending:
+                    break
+                item = self._pending.popleft()
+
+            self._output(*item)
+            count += 1
+
+        return count
+
+    def _loop(self) -> None:
+        while not self._stop_event.wait(self._interval):
+            self.flush(limit=self._max_reports_per_interval)
+
+    def stop(self) -> None:
+        """停止后台线程并输出队列中剩余的异常"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+        self.flush()
+
+
+_error_reporter = ErrorReporter()
+atexit_register(lambda: _error_reporter.flush())
+
+
+def get_error_reporter() -> ErrorReporter:
+    return _error_reporter
+
+
+def set_error_reporter(reporter: ErrorReporter) -> None:
+    """替换全局异常上报器，原上报器队列中的异常会被输出"""
+    global _error_reporter
+
+    old_reporter, _error_reporter = _error_reporter, reporter
+    old_reporter.stop()
@@ -1,9 +1,8 @@
 from enum import Enum
-from traceback import print_exception
 from typing import Any, Dict, Generic, List, Optional, TypeVar, cast
 
-from litestar import Request, Response
-from litestar.exceptions import ValidationException
+from litestar import MediaType, Request, Response
+from litestar.exceptions import ClientException, ValidationException
 from litestar.exceptions.http_exceptions import (
     MethodNotAllowedException,
     NotFoundException,
@@ -17,24 +16,20 @@ from litestar.status_codes import (
     HTTP_500_INTERNAL_SERVER_ERROR,
 )
 from litestar.types import ExceptionHandlersMap
-from msgspec import Struct
+from msgspec import DecodeError, Raw, Struct
+from msgspec import ValidationError as MsgspecValidationError
 
+from sspeedup.api._msgspec import ENCODED_EMPTY_BODIES
+
+# 请求与响应模型的配置在各框架的集成中共用，此处重新导出
+from sspeedup.api._msgspec import REQUEST_STRUCT_CONFIG as REQUEST_STRUCT_CONFIG
+from sspeedup.api._msgspec import RESPONSE_STRUCT_CONFIG as RESPONSE_STRUCT_CONFIG
 from sspeedup.api.code import Code, get_default_msg, is_ok
+from sspeedup.api.error_reporter import get_error_reporter
+from sspeedup.api.timing._base import record_api_code
 
 _T = TypeVar("_T")
 
-REQUEST_STRUCT_CONFIG: Dict[str, Any] = {
-    "frozen": True,
-    "kw_only": True,
-    "forbid_unknown_fields": True,
-    "rename": "camel",
-}
-
-RESPONSE_STRUCT_CONFIG: Dict[str, Any] = {
-    "kw_only": True,
-    "rename": "camel",
-}
-
 
 class ResponseStruct(Struct, Generic[_T], frozen=True, kw_only=True):
     ok: bool
@@ -43,13 +38,18 @@ class ResponseStruct(Struct, Generic[_T], frozen=True, kw_only=True):
     data: _T
 
 
-def success(
-    *,
-    http_code: int = HTTP_200_OK,
-    api_code: Code = Code.SUCCESS,
-    msg: Optional[str] = None,
-    data: _T = None,
-) -> Response[ResponseStruct[_T]]:
+def _response(
+    *, http_code: int, api_code: Code, msg: Optional[str], data: Any
+) -> Response[Any]:
+    record_api_code(api_code)
+    if data is None and not msg:
+        return Response(
+            # 与 ResponseStruct 的编码结果一致，无数据时直接使用预编码的响应体
+            ENCODED_EMPTY_BODIES[api_code],
+            status_code=http_code,
+            media_type=MediaType.JSON,
+        )
+
     return Response(
         ResponseStruct(
             ok=is_ok(api_code),
@@ -61,6 +61,16 @@ def success(
     )
 
 
+def success(
+    *,
+    http_code: int = HTTP_200_OK,
+    api_code: Code = Code.SUCCESS,
+    msg: Optional[str] = None,
+    data: _T = None,
+) -> Response[ResponseStruct[_T]]:
+    return _response(http_code=http_code, api_code=api_code, msg=msg, data=data)
+
+
 def fail(
     *,
     http_code: int = HTTP_500_INTERNAL_SERVER_ERROR,
@@ -68,15 +78,18 @@ def fail(
     msg: Optional[str] = None,
     data: _T = None,
 ) -> Response[ResponseStruct[_T]]:
-    return Response(
-        ResponseStruct(
-            ok=is_ok(api_code),
-            code=api_code,
-            msg=msg if msg else get_default_msg(api_code),
-            data=data,
-        ),
-        status_code=http_code,
-    )
+    return _response(http_code=http_code, api_code=api_code, msg=msg, data=data)
+
+
+def response_with_encoded_data(
+    *,
+    http_code: int = HTTP_200_OK,
+    api_code: Code = Code.SUCCESS,
+    msg: Optional[str] = None,
+    data: bytes,
+) -> Response[ResponseStruct[Any]]:
+    """data 为已编码的 JSON，直接嵌入响应体中，不再重复编码"""
+    return _response(http_code=http_code, api_code=api_code, msg=msg, data=Raw(data))
 
 
 def _format_validation_errors(
@@ -118,25 +131,34 @@ def method_not_allowd_exception_handler(
     return Response(b"", status_code=HTTP_405_METHOD_NOT_ALLOWED)
 
 
-_DESERIALIZE_FAILED_ARGS_STRING = {
-    "400: Input data was truncated",
-    "400: JSON is malformed",
-}
+def _is_deserialize_failed(exception: BaseException) -> bool:
+    # 请求体解析失败时，Litestar 抛出的异常链为
+    # ClientException <- SerializationException <- msgspec.DecodeError
+    # 响应编码失败时抛出的 SerializationException 不是 ClientException，需排除
+    if not isinstance(exception, ClientException):
+        return False
+
+    current = exception.__cause__
+    while current is not None:
+        if isinstance(current, DecodeError):
+            # ValidationError 是 DecodeError 的子类，需排除
+            return not isinstance(current, MsgspecValidationError)
+        current = current.__cause__
+
+    return False
 
 
 def internal_server_exception_handler(
     _: Request, exception: Exception
 ) -> Response[ResponseStruct]:
-    if len(exception.args) == 1:
-        for item in _DESERIALIZE_FAILED_ARGS_STRING:
-            if item in exception.args[0]:
-                # 反序列化失败
-                return fail(
-                    http_code=HTTP_400_BAD_REQUEST,
-                    api_code=Code.DESERIALIZE_FAILED,
-                )
-
-    print_exception(exception)
+    if _is_deserialize_failed(exception):
+        return fail(
+            http_code=HTTP_400_BAD_REQUEST,
+            api_code=Code.DESERIALIZE_FAILED,
+        )
+
+    # 在后台线程中去重并输出，避免在请求处理过程中同步写入 stderr
+    get_error_reporter().report(exception)
 
     return fail(
         http_code=HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1 @@
+from sspeedup.api.load_shedding._base import LoadShedder, Priority
@@ -0,0 +1,86 @@
+from threading import Lock
+from time import monotonic
+from typing import Dict, Literal, Optional
+
+Priority = Literal["high", "normal", "low"]
+
+# 各优先级请求可使用的并发数占并发上限的比例
+# 低优先级请求在负载较高时首先被拒绝，高优先级请求可少量超出上限
+_DEFAULT_PRIORITY_RATIOS: Dict[Priority, float] = {
+    "high": 1.25,
+    "normal": 1.0,
+    "low": 0.75,
+}
+
+
+class LoadShedder:
+    """基于 AIMD 算法的自适应并发限制器
+
+    请求耗时低于目标值时，每个完成的请求使并发上限增加 1 / 上限（即每轮增加 1），
+    高于目标值时，并发上限按比例下降，且每个目标耗时周期内至多下降一次。
+    """
+
+    def __init__(
+        self,
+        *,
+        target_latency: float,
+        initial_limit: int = 100,
+        min_limit: int = 10,
+        max_limit: int = 1000,
+        decrease_factor: float = 0.9,
+        priority_ratios: Optional[Dict[Priority, float]] = None,
+    ) -> None:
+        if target_latency <= 0:
+            raise ValueError("target_latency 必须大于 0")
+        if not 0 < min_limit <= initial_limit <= max_limit:
+            raise ValueError("必须满足 0 < min_limit <= initial_limit <= max_limit")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor 必须在 0 到 1 之间")
+
+        self._target_latency = target_latency
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._decrease_factor = decrease_factor
+        self._priority_ratios = {**_DEFAULT_PRIORITY_RATIOS, **(priority_ratios or {})}
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._last_decrease_time = 0.0
+        self._rejected = 0
+        self._lock = Lock()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def rejected(self) -> int:
+        return self._rejected
+
+    def try_acquire(self, priority: Priority = "normal") -> bool:
+        with self._lock:
+            if self._in_flight >= self._limit * self._priority_ratios[priority]:
+                self._rejected += 1
+                return False
+
+            self._in_flight += 1
+            return True
+
+    def release(self, latency: float) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+            if latency > self._target_latency:
+                now = monotonic()
+                if now - self._last_decrease_time >= self._target_latency:
+                    self._last_decrease_time = now
+                    self._limit = max(
+                        self._min_limit, self._limit * self._decrease_factor
+                    )
+            # 仅在并发数接近上限时增加上限，避免空闲时上限无限增长
+            elif self._in_flight * 2 >= self._limit:
+                self._limit = min(self._max_limit, self._limit + 1 / self._limit)
@@ -0,0 +1,61 @@
+from time import perf_counter
+from typing import Callable, Optional
+
+from litestar import Request
+from litestar.enums import ScopeType
+from litestar.status_codes import HTTP_503_SERVICE_UNAVAILABLE
+from litestar.types import ASGIApp, Receive, Scope, Send
+
+from sspeedup.api.code import Code
+from sspeedup.api.litestar import fail
+from sspeedup.api.load_shedding._base import LoadShedder, Priority
+
+
+def _get_priority_from_opt(scope: Scope) -> Priority:
+    route_handler = scope.get("route_handler")
+    if not route_handler:
+        return "normal"
+
+    return route_handler.opt.get("priority", "normal")
+
+
+def create_load_shedding_middleware(
+    shedder: LoadShedder,
+    *,
+    priority_getter: Optional[Callable[[Scope], Priority]] = None,
+) -> Callable[[ASGIApp], ASGIApp]:
+    """创建过载保护中间件，传入 Litestar 的 middleware 参数
+
+    默认从路由的 opt 中读取优先级，如 @get("/", opt={"priority": "low"})。
+
+    Args:
+        shedder (LoadShedder): 并发限制器
+        priority_getter (Optional[Callable[[Scope], Priority]], optional):
+            自定义获取请求优先级的方式. Defaults to None.
+    """
+    get_priority = priority_getter or _get_priority_from_opt
+
+    def middleware_factory(app: ASGIApp) -> ASGIApp:
+        async def middleware(scope: Scope, receive: Receive, send: Send) -> None:
+            if scope["type"] != ScopeType.HTTP:
+                await app(scope, receive, send)
+                return
+
+            if not shedder.try_acquire(get_priority(scope)):
+                response = fail(
+                    http_code=HTTP_503_SERVICE_UNAVAILABLE, api_code=Code.OVERLOAD
+                )
+                await response.to_asgi_response(None, Request(scope, receive))(
+                    scope, receive, send
+                )
+                return
+
+            start_time = perf_counter()
+            try:
+                await app(scope, receive, send)
+            finally:
+                shedder.release(perf_counter() - start_time)
+
+        return middleware
+
+    return middleware_factory
@@ -0,0 +1,74 @@
+from functools import wraps
+from inspect import isawaitable
+from time import perf_counter
+from typing import Any, Callable, Optional
+from weakref import WeakSet
+
+from sanic import Request, Sanic
+
+from sspeedup.api.code import Code
+from sspeedup.api.load_shedding._base import LoadShedder, Priority
+from sspeedup.api.sanic import get_response_json
+
+_HTTP_503_SERVICE_UNAVAILABLE = 503
+
+
+def _get_priority_from_route_ctx(request: Request) -> Priority:
+    if not request.route:
+        return "normal"
+
+    return getattr(request.route.ctx, "priority", "normal")
+
+
+def setup_load_shedding(
+    app: Sanic,
+    shedder: LoadShedder,
+    *,
+    priority_getter: Optional[Callable[[Request], Priority]] = None,
+) -> None:
+    """为 Sanic 应用的全部路由添加过载保护
+
+    服务启动前包装各路由的处理函数，请求中间件执行后、处理函数执行前获取并发名额。
+    默认从路由的 ctx 中读取优先级，如 @app.get("/", ctx_priority="low")。
+
+    Args:
+        app (Sanic): Sanic 应用
+        shedder (LoadShedder): 并发限制器
+        priority_getter (Optional[Callable[[Request], Priority]], optional):
+            自定义获取请求优先级的方式. Defaults to None.
+    """
+    get_priority = priority_getter or _get_priority_from_route_ctx
+    wrapped_handlers: "WeakSet[Callable[..., Any]]" = WeakSet()
+
+    def wrap_handler(handler: Callable[..., Any]) -> Callable[..., Any]:
+        # 在处理函数外层获取与释放，请求被取消或客户端断开连接时同样会释放
+        @wraps(handler)
+        async def inner(request: Request, *args: Any, **kwargs: Any) -> Any:
+            if not shedder.try_acquire(get_priority(request)):
+                response = get_response_json(code=Code.OVERLOAD)
+                response.status = _HTTP_503_SERVICE_UNAVAILABLE
+                return response
+
+            start_time = perf_counter()
+            try:
+                response = handler(request, *args, **kwargs)
+                if isawaitable(response):
+                    response = await response
+                return response
+            finally:
+                shedder.release(perf_counter() - start_time)
+
+        wrapped_handlers.add(inner)
+        return inner
+
+    async def on_before_server_start(app: Sanic) -> None:
+        for route in app.router.routes:
+            # WebSocket 连接为长连接，不参与并发限制
+            if route.handler in wrapped_handlers or hasattr(
+                route.handler, "is_websocket"
+            ):
+                continue
+
+            route.handler = wrap_handler(route.handler)
+
+    app.register_listener(on_before_server_start, "before_server_start")
@@ -0,0 +1,9 @@
+from sspeedup.api.rate_limit._base import (
+    RateLimitAlgorithm,
+    RateLimitBackend,
+    RateLimiter,
+    RateLimitRule,
+    RateLimitScope,
+)
+from sspeedup.api.rate_limit.memory import MemoryRateLimitBackend
+from sspeedup.api.rate_limit.mongo import MongoRateLimitBackend
@@ -0,0 +1,165 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from math import floor
+from typing import List, Literal, Optional, Sequence, Tuple
+
+from sspeedup.api.code import Code
+
+RateLimitScope = Literal["global", "user", "ip"]
+RateLimitAlgorithm = Literal["token_bucket", "sliding_window"]
+
+_SCOPE_TO_CODE = {
+    "global": Code.RATE_LIMIT_GLOBAL,
+    "user": Code.RATE_LIMIT_BY_USER,
+    "ip": Code.RATE_LIMIT_BY_IP,
+}
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    scope: RateLimitScope
+    # 每个周期内允许的请求数
+    limit: int
+    # 周期（秒）
+    period: float
+    algorithm: RateLimitAlgorithm = "token_bucket"
+    # 令牌桶容量，默认等于 limit
+    burst: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.limit <= 0:
+            raise ValueError("limit 必须大于 0")
+        if self.period <= 0:
+            raise ValueError("period 必须大于 0")
+        if self.burst is not None and self.burst <= 0:
+            raise ValueError("burst 必须大于 0")
+
+
+def _token_bucket(
+    state: Optional[List[float]], rule: RateLimitRule, now: float
+) -> Tuple[List[float], float, float]:
+    """令牌桶算法
+
+    state 为 [剩余令牌数, 上次更新时间]。
+
+    Returns:
+        Tuple[List[float], float, float]: 新状态、需等待的时间（为 0 时允许请求）、
+            状态过期时间
+    """
+    capacity = rule.burst or rule.limit
+    rate = rule.limit / rule.period
+
+    if state is None:
+        tokens = float(capacity)
+    else:
+        tokens = min(capacity, state[0] + (now - state[1]) * rate)
+
+    if tokens >= 1:
+        tokens -= 1
+        wait = 0.0
+    else:
+        wait = (1 - tokens) / rate
+
+    # 令牌桶回满后，状态与新建时相同，可以清除
+    return [tokens, now], wait, now + (capacity - tokens) / rate
+
+
+def _sliding_window(
+    state: Optional[List[float]], rule: RateLimitRule, now: float
+) -> Tuple[List[float], float, float]:
+    """滑动窗口算法，以上一窗口计数按时间加权估算当前窗口内的请求数
+
+    state 为 [窗口序号, 当前窗口计数, 上一窗口计数]。
+
+    Returns:
+        Tuple[List[float], float, float]: 新状态、需等待的时间（为 0 时允许请求）、
+            状态过期时间
+    """
+    window = floor(now / rule.period)
+    if state is None or state[0] < window - 1:
+        count, previous_count = 0.0, 0.0
+    elif state[0] == window - 1:
+        count, previous_count = 0.0, state[1]
+    else:
+        count, previous_count = state[1], state[2]
+
+    elapsed = now - window * rule.period
+    weight = 1 - elapsed / rule.period
+
+    if previous_count * weight + count + 1 <= rule.limit:
+        count += 1
+        wait = 0.0
+    elif count + 1 > rule.limit or previous_count == 0:
+        wait = rule.period - elapsed
+    else:
+        # 等待上一窗口的权重下降到足以容纳本次请求
+        target_weight = (rule.limit - count - 1) / previous_count
+        wait = (weight - target_weight) * rule.period
+
+    return [window, count, previous_count], wait, (window + 2) * rule.period
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    async def acquire(
+        self, items: Sequence[Tuple[str, RateLimitRule]]
+    ) -> Optional[Tuple[int, float]]:
+        """尝试为每条规则消耗一次请求配额
+
+        任一规则拒绝请求时，所有规则均不消耗配额，被拒绝的请求不计入配额。
+
+        Args:
+            items (Sequence[Tuple[str, RateLimitRule]]): 限流键与规则
+
+        Returns:
+            Optional[Tuple[int, float]]: 允许请求时为 None，否则为第一条拒绝请求的规则
+                在 items 中的位置，与建议的重试等待时间（秒）
+        """
+        raise NotImplementedError
+
+
+class RateLimiter:
+    def __init__(
+        self, rules: Sequence[RateLimitRule], *, backend: RateLimitBackend
+    ) -> None:
+        if not rules:
+            raise ValueError("rules 不能为空")
+
+        self._rules = tuple(rules)
+        self._backend = backend
+
+    async def check(
+        self, *, ip: Optional[str] = None, user: Optional[str] = None
+    ) -> Optional[Tuple[Code, float]]:
+        """检查请求是否被限流
+
+        缺少对应标识（如未登录用户）的规则会被跳过。
+        先检查所有规则，全部通过后才消耗配额，被拒绝的请求不占用其它规则的配额。
+
+        Returns:
+            Optional[Tuple[Code, float]]: 未被限流时为 None，否则为错误码与重试等待时间
+        """
+        items: List[Tuple[str, RateLimitRule]] = []
+        for index, rule in enumerate(self._rules):
+            if rule.scope == "global":
+                key = f"{index}"
+            elif rule.scope == "ip":
+                if not ip:
+                    continue
+                key = f"{index}:{ip}"
+            else:
+                if not user:
+                    continue
+                key = f"{index}:{user}"
+
+            items.append((key, rule))
+
+        if not items:
+            return None
+
+        result = await self._backend.acquire(items)
+        if result is None:
+            return None
+
+        position, wait = result
+        return _SCOPE_TO_CODE[items[position][1].scope], wait
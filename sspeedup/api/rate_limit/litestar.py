@@ -0,0 +1,48 @@
+from math import ceil
+from typing import Callable, Optional
+
+from litestar import Request
+from litestar.enums import ScopeType
+from litestar.status_codes import HTTP_429_TOO_MANY_REQUESTS
+from litestar.types import ASGIApp, Receive, Scope, Send
+
+from sspeedup.api.litestar import fail
+from sspeedup.api.rate_limit._base import RateLimiter
+
+
+def create_rate_limit_middleware(
+    limiter: RateLimiter,
+    *,
+    user_key_getter: Optional[Callable[[Request], Optional[str]]] = None,
+) -> Callable[[ASGIApp], ASGIApp]:
+    """创建限流中间件，传入 Litestar 的 middleware 参数
+
+    Args:
+        limiter (RateLimiter): 限流器
+        user_key_getter (Optional[Callable[[Request], Optional[str]]], optional):
+            从请求中获取用户标识，未登录时返回 None. Defaults to None.
+    """
+
+    def middleware_factory(app: ASGIApp) -> ASGIApp:
+        async def middleware(scope: Scope, receive: Receive, send: Send) -> None:
+            if scope["type"] != ScopeType.HTTP:
+                await app(scope, receive, send)
+                return
+
+            request: Request = Request(scope, receive)
+            result = await limiter.check(
+                ip=request.client.host if request.client else None,
+                user=user_key_getter(request) if user_key_getter else None,
+            )
+            if not result:
+                await app(scope, receive, send)
+                return
+
+            code, wait = result
+            response = fail(http_code=HTTP_429_TOO_MANY_REQUESTS, api_code=code)
+            response.headers["Retry-After"] = str(ceil(wait))
+            await response.to_asgi_response(None, request)(scope, receive, send)
+
+        return middleware
+
+    return middleware_factory
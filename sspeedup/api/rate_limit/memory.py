@@ -0,0 +1,84 @@
+from threading import Lock
+from time import monotonic
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sspeedup.api.rate_limit._base import (
+    RateLimitBackend,
+    RateLimitRule,
+    _sliding_window,
+    _token_bucket,
+)
+
+
+class _Shard:
+    def __init__(self) -> None:
+        self.lock = Lock()
+        # key -> (状态, 过期时间)
+        self.data: Dict[str, Tuple[List[float], float]] = {}
+        self.ops = 0
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """分片的进程内限流存储，各进程间不共享状态"""
+
+    def __init__(self, *, shards: int = 16, cleanup_interval: int = 1024) -> None:
+        if shards <= 0:
+            raise ValueError("shards 必须大于 0")
+        if cleanup_interval <= 0:
+            raise ValueError("cleanup_interval 必须大于 0")
+
+        self._shards = tuple(_Shard() for _ in range(shards))
+        self._cleanup_interval = cleanup_interval
+
+    def _cleanup(self, shard: _Shard, now: float) -> None:
+        expired_keys = [k for k, (_, expire) in shard.data.items() if expire <= now]
+        for key in expired_keys:
+            del shard.data[key]
+
+    def __len__(self) -> int:
+        return sum(len(shard.data) for shard in self._shards)
+
+    async def acquire(
+        self, items: Sequence[Tuple[str, RateLimitRule]]
+    ) -> Optional[Tuple[int, float]]:
+        shard_indexes = [hash(key) % len(self._shards) for key, _ in items]
+        # 按固定顺序加锁，避免并发请求间死锁
+        locked_shards = [self._shards[x] for x in sorted(set(shard_indexes))]
+        for shard in locked_shards:
+            shard.lock.acquire()
+
+        try:
+            now = monotonic()
+
+            # 每个分片每处理一定次数的请求后清理一次过期状态，均摊开销
+            for shard in locked_shards:
+                shard.ops += 1
+                if shard.ops >= self._cleanup_interval:
+                    shard.ops = 0
+                    self._cleanup(shard, now)
+
+            new_states: List[Tuple[_Shard, str, List[float], float]] = []
+            for position, ((key, rule), shard_index) in enumerate(
+                zip(items, shard_indexes)
+            ):
+                algorithm = (
+                    _token_bucket
+                    if rule.algorithm == "token_bucket"
+                    else _sliding_window
+                )
+                shard = self._shards[shard_index]
+                item = shard.data.get(key)
+                state, wait, expire = algorithm(item[0] if item else None, rule, now)
+                # 拒绝时不写入新状态，其它规则的配额也不会被消耗
+                if wait > 0:
+                    return position, wait
+
+                new_states.append((shard, key, state, expire))
+
+            for shard, key, state, expire in new_states:
+                shard.data[key] = (state, expire)
+        finally:
+            for shard in reversed(locked_shards):
+                shard.lock.release()
+
+        return None
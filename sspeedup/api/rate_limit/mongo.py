@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+from math import floor
+from time import time
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sspeedup.api.rate_limit._base import RateLimitBackend, RateLimitRule
+
+
+class MongoRateLimitBackend(RateLimitBackend):
+    """基于 MongoDB 的限流存储，可在多个进程间共享状态
+
+    仅支持滑动窗口算法，每条规则需要两次数据库操作。
+    先增加计数再判断是否超出限制，请求被拒绝时回退已增加的计数，
+    与内存存储相同，被拒绝的请求不计入配额。
+    """
+
+    def __init__(self, collection: Any) -> None:
+        # Motor 异步集合
+        self._collection = collection
+
+    async def init(self) -> None:
+        # 窗口计数在过期后由 MongoDB 自动清除
+        await self._collection.create_index("expire_at", expireAfterSeconds=0)
+
+    async def _acquire_one(self, key: str, rule: RateLimitRule) -> Tuple[str, float]:
+        """增加当前窗口的计数
+
+        Returns:
+            Tuple[str, float]: 计数文档的 ID，与需等待的时间（为 0 时允许请求）
+        """
+        now = time()
+        window = floor(now / rule.period)
+        document_id = f"{key}:{window}"
+
+        current = await self._collection.find_one_and_update(
+            {"_id": document_id},
+            {
+                "$inc": {"count": 1},
+                "$setOnInsert": {
+                    # PyMongo 将无时区的 datetime 视为 UTC，需显式指定时区
+                    "expire_at": datetime.fromtimestamp(
+                        (window + 2) * rule.period, tz=timezone.utc
+                    )
+                },
+            },
+            upsert=True,
+            return_document=True,  # 即 ReturnDocument.AFTER，返回更新后的文档
+        )
+        previous = await self._collection.find_one({"_id": f"{key}:{window - 1}"})
+
+        count: int = current["count"]
+        previous_count: int = previous["count"] if previous else 0
+
+        elapsed = now - window * rule.period
+        weight = 1 - elapsed / rule.period
+
+        # 计数中已包含本次请求
+        if previous_count * weight + count <= rule.limit:
+            return document_id, 0.0
+        if count > rule.limit or previous_count == 0:
+            return document_id, rule.period - elapsed
+
+        target_weight = (rule.limit - count) / previous_count
+        return document_id, (weight - target_weight) * rule.period
+
+    async def acquire(
+        self, items: Sequence[Tuple[str, RateLimitRule]]
+    ) -> Optional[Tuple[int, float]]:
+        for _, rule in items:
+            if rule.algorithm != "sliding_window":
+                raise ValueError("MongoRateLimitBackend 仅支持滑动窗口算法")
+
+        document_ids: List[str] = []
+        for position, (key, rule) in enumerate(items):
+            document_id, wait = await self._acquire_one(key, rule)
+            document_ids.append(document_id)
+
+            if wait > 0:
+                # 回退本次请求在各规则中增加的计数
+                await self._collection.update_many(
+                    {"_id": {"$in": document_ids}}, {"$inc": {"count": -1}}
+                )
+                return position, wait
+
+        return None
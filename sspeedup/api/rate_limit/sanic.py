@@ -0,0 +1,39 @@
+from math import ceil
+from typing import Awaitable, Callable, Optional
+
+from sanic import HTTPResponse, Request
+
+from sspeedup.api.rate_limit._base import RateLimiter
+from sspeedup.api.sanic import get_response_json
+
+_HTTP_429_TOO_MANY_REQUESTS = 429
+
+
+def create_rate_limit_middleware(
+    limiter: RateLimiter,
+    *,
+    user_key_getter: Optional[Callable[[Request], Optional[str]]] = None,
+) -> Callable[[Request], Awaitable[Optional[HTTPResponse]]]:
+    """创建限流中间件，通过 app.register_middleware(middleware, "request") 注册
+
+    Args:
+        limiter (RateLimiter): 限流器
+        user_key_getter (Optional[Callable[[Request], Optional[str]]], optional):
+            从请求中获取用户标识，未登录时返回 None. Defaults to None.
+    """
+
+    async def middleware(request: Request) -> Optional[HTTPResponse]:
+        result = await limiter.check(
+            ip=request.client_ip or None,
+            user=user_key_getter(request) if user_key_getter else None,
+        )
+        if not result:
+            return None
+
+        code, wait = result
+        response = get_response_json(code=code)
+        response.status = _HTTP_429_TOO_MANY_REQUESTS
+        response.headers["Retry-After"] = str(ceil(wait))
+        return response
+
+    return middleware
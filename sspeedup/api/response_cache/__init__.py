@@ -0,0 +1,8 @@
+from sspeedup.api.response_cache._base import (
+    CacheEntry,
+    ResponseCache,
+    etag_matches,
+    make_cache_key,
+    make_etag,
+    make_variant_etag,
+)
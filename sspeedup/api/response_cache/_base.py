@@ -0,0 +1,195 @@
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Dict, Iterable, NamedTuple, Optional, Set, Union
+from urllib.parse import parse_qsl, urlencode
+
+if TYPE_CHECKING:
+    from sspeedup.api.compression import Compressor, Encoding
+
+
+class CacheEntry(NamedTuple):
+    body: bytes
+    content_type: str
+    etag: str
+    expire_time: float
+    tags: frozenset
+    # 压缩算法 -> 压缩后的响应体，首次以该算法返回时写入
+    compressed: Dict[str, bytes]
+
+
+def make_cache_key(path: str, query_string: Union[str, bytes]) -> str:
+    """以路径和规范化后的查询参数生成缓存键，参数顺序不影响结果"""
+    if isinstance(query_string, bytes):
+        query_string = query_string.decode("latin-1")
+    if not query_string:
+        return path
+
+    query = sorted(parse_qsl(query_string, keep_blank_values=True))
+    return f"{path}?{urlencode(query)}"
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def make_variant_etag(etag: str, encoding: Optional[str]) -> str:
+    """不同压缩算法的响应体互不相同，强 ETag 也需要区分"""
+    if not encoding:
+        return etag
+
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    for item in if_none_match.split(","):
+        candidate = item.strip()
+        # If-None-Match 使用弱比较，忽略 W/ 前缀
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+
+    return False
+
+
+class ResponseCache:
+    """以编码后的响应体为单位的 LRU 缓存，支持过期时间、容量限制与按标签失效"""
+
+    def __init__(
+        self, *, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries 必须大于 0")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes 必须大于 0")
+
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+
+        self._data: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._size = 0
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _remove(self, key: str) -> None:
+        entry = self._data.pop(key)
+        self._size -= len(entry.body) + sum(len(x) for x in entry.compressed.values())
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is None:
+                continue
+
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._data.get(key)
+            if not entry:
+                return None
+
+            if entry.expire_time <= monotonic():
+                self._remove(key)
+                return None
+
+            self._data.move_to_end(key)
+            return entry
+
+    def set(
+        self,
+        key: str,
+        body: bytes,
+        *,
+        content_type: str,
+        ttl: float,
+        tags: Iterable[str] = (),
+    ) -> Optional[CacheEntry]:
+        """写入缓存，响应体超过容量限制时不缓存并返回 None"""
+        if len(body) > self._max_bytes:
+            return None
+
+        entry = CacheEntry(
+            body=body,
+            content_type=content_type,
+            etag=make_etag(body),
+            expire_time=monotonic() + ttl,
+            tags=frozenset(tags),
+            compressed={},
+        )
+
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+            self._data[key] = entry
+            self._size += len(body)
+            for tag in entry.tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            self._evict()
+
+        return entry
+
+    def _evict(self) -> None:
+        # 淘汰最久未使用的条目
+        while len(self._data) > self._max_entries or self._size > self._max_bytes:
+            self._remove(next(iter(self._data)))
+
+    async def get_compressed_body(
+        self,
+        key: str,
+        entry: CacheEntry,
+        *,
+        compressor: "Compressor",
+        encoding: "Encoding",
+    ) -> bytes:
+        """获取缓存条目压缩后的响应体，未压缩过时压缩并写入缓存
+
+        同一条目的每种压缩算法仅压缩一次，压缩结果计入缓存容量。
+        """
+        body = entry.compressed.get(encoding)
+        if body is not None:
+            return body
+
+        body = await compressor.compress_async(entry.body, encoding)
+        with self._lock:
+            # 条目可能已在压缩期间被替换或淘汰
+            if self._data.get(key) is entry and encoding not in entry.compressed:
+                entry.compressed[encoding] = body
+                self._size += len(body)
+                self._evict()
+
+        return body
+
+    def invalidate_tags(self, *tags: str) -> int:
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._tags.get(tag, ()))
+
+            for key in keys:
+                self._remove(key)
+
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._tags.clear()
+            self._size = 0
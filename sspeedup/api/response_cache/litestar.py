@@ -0,0 +1,175 @@
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional, Tuple
+
+from litestar.enums import ScopeType
+from litestar.types import ASGIApp, Message, Receive, Scope, Send
+
+from sspeedup.api.response_cache._base import (
+    CacheEntry,
+    ResponseCache,
+    etag_matches,
+    make_cache_key,
+    make_variant_etag,
+)
+
+if TYPE_CHECKING:
+    from sspeedup.api.compression import Compressor
+
+_CACHEABLE_METHODS = {"GET", "HEAD"}
+
+
+def _get_header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+
+    return None
+
+
+async def _send_cached(
+    cache: ResponseCache,
+    key: str,
+    entry: CacheEntry,
+    *,
+    scope: Scope,
+    compressor: Optional["Compressor"],
+    send: Send,
+) -> None:
+    body = entry.body
+    encoding = None
+    if compressor:
+        encoding = compressor.negotiate(_get_header(scope, b"accept-encoding"))
+        if encoding and compressor.should_compress(body, entry.content_type):
+            body = await cache.get_compressed_body(
+                key, entry, compressor=compressor, encoding=encoding
+            )
+        else:
+            encoding = None
+
+    etag = make_variant_etag(entry.etag, encoding)
+    headers: List[Tuple[bytes, bytes]] = [(b"etag", etag.encode())]
+    if compressor:
+        headers.append((b"vary", b"Accept-Encoding"))
+
+    if etag_matches(_get_header(scope, b"if-none-match"), etag):
+        await send({"type": "http.response.start", "status": 304, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+        return
+
+    headers.append((b"content-type", entry.content_type.encode()))
+    headers.append((b"content-length", str(len(body)).encode()))
+    if encoding:
+        headers.append((b"content-encoding", encoding.encode()))
+    await send({"type": "http.response.start", "status": 200, "headers": headers})
+    is_head = scope["method"] == "HEAD"
+    await send({"type": "http.response.body", "body": b"" if is_head else body})
+
+
+def create_response_cache_middleware(
+    cache: ResponseCache,
+    *,
+    ttl: float,
+    tags: Iterable[str] = (),
+    tags_getter: Optional[Callable[[Scope], Iterable[str]]] = None,
+    compressor: Optional["Compressor"] = None,
+) -> Callable[[ASGIApp], ASGIApp]:
+    """创建响应缓存中间件，可传入应用或路由的 middleware 参数
+
+    仅缓存 GET 请求中状态码为 200、未使用流式传输且未设置 Content-Encoding 的响应，
+    位于压缩中间件之外时，已压缩的响应不会被缓存，需要压缩时请传入 compressor 参数。
+    命中缓存时不调用处理函数，请求携带匹配的 If-None-Match 时返回 304。
+    缓存的响应仅保留 Content-Type 响应头。
+
+    Args:
+        cache (ResponseCache): 响应缓存
+        ttl (float): 缓存有效期（秒）
+        tags (Iterable[str], optional): 缓存标签，用于批量失效. Defaults to ().
+        tags_getter (Optional[Callable[[Scope], Iterable[str]]], optional):
+            根据请求生成额外的缓存标签. Defaults to None.
+        compressor (Optional[Compressor], optional): 传入时按 Accept-Encoding
+            返回压缩后的响应体，压缩结果随缓存条目保存. Defaults to None.
+    """
+    static_tags = tuple(tags)
+
+    def middleware_factory(app: ASGIApp) -> ASGIApp:
+        async def middleware(scope: Scope, receive: Receive, send: Send) -> None:
+            if (
+                scope["type"] != ScopeType.HTTP
+                or scope["method"] not in _CACHEABLE_METHODS
+            ):
+                await app(scope, receive, send)
+                return
+
+            key = make_cache_key(scope["path"], scope["query_string"])
+
+            entry = cache.get(key)
+            if entry:
+                await _send_cached(
+                    cache, key, entry, scope=scope, compressor=compressor, send=send
+                )
+                return
+
+            # HEAD 请求的响应没有响应体，不能写入缓存
+            if scope["method"] == "HEAD":
+                await app(scope, receive, send)
+                return
+
+            start_message: Optional[Message] = None
+            passthrough = False
+
+            async def capture_send(message: Message) -> None:
+                nonlocal start_message, passthrough
+
+                if passthrough:
+                    await send(message)
+                    return
+
+                if message["type"] == "http.response.start":
+                    # 已压缩的响应体不能以其它编码返回
+                    if message["status"] != 200 or any(
+                        header_key.lower() == b"content-encoding"
+                        for header_key, _ in message["headers"]
+                    ):
+                        passthrough = True
+                        await send(message)
+                    else:
+                        start_message = message
+                    return
+
+                if message["type"] != "http.response.body" or start_message is None:
+                    await send(message)
+                    return
+
+                if message.get("more_body", False):
+                    # 流式响应，不缓存
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                content_type = ""
+                for header_key, value in start_message["headers"]:
+                    if header_key.lower() == b"content-type":
+                        content_type = value.decode("latin-1")
+                        break
+
+                entry = cache.set(
+                    key,
+                    message.get("body", b""),
+                    content_type=content_type,
+                    ttl=ttl,
+                    tags=static_tags + tuple(tags_getter(scope) if tags_getter else ()),
+                )
+                if not entry:  # 响应体过大
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                await _send_cached(
+                    cache, key, entry, scope=scope, compressor=compressor, send=send
+                )
+
+            await app(scope, receive, capture_send)
+
+        return middleware
+
+    return middleware_factory
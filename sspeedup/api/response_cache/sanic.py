@@ -0,0 +1,108 @@
+from functools import wraps
+from inspect import isawaitable
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable, Optional
+
+from sanic import HTTPResponse, Request
+
+from sspeedup.api.response_cache._base import (
+    CacheEntry,
+    ResponseCache,
+    etag_matches,
+    make_cache_key,
+    make_variant_etag,
+)
+
+if TYPE_CHECKING:
+    from sspeedup.api.compression import Compressor
+
+
+async def _build_response(
+    cache: ResponseCache,
+    key: str,
+    entry: CacheEntry,
+    request: Request,
+    compressor: Optional["Compressor"],
+) -> HTTPResponse:
+    body = entry.body
+    encoding = None
+    if compressor:
+        encoding = compressor.negotiate(request.headers.get("Accept-Encoding"))
+        if encoding and compressor.should_compress(body, entry.content_type):
+            body = await cache.get_compressed_body(
+                key, entry, compressor=compressor, encoding=encoding
+            )
+        else:
+            encoding = None
+
+    headers = {"ETag": make_variant_etag(entry.etag, encoding)}
+    if compressor:
+        headers["Vary"] = "Accept-Encoding"
+
+    if etag_matches(request.headers.get("If-None-Match"), headers["ETag"]):
+        return HTTPResponse(status=304, headers=headers)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return HTTPResponse(body, headers=headers, content_type=entry.content_type)
+
+
+def cache_response(
+    cache: ResponseCache,
+    *,
+    ttl: float,
+    tags: Iterable[str] = (),
+    tags_getter: Optional[Callable[[Request], Iterable[str]]] = None,
+    compressor: Optional["Compressor"] = None,
+) -> Callable:
+    """缓存 GET 处理函数的响应，支持同步与异步处理函数
+
+    仅缓存状态码为 200 且未设置 Content-Encoding 的响应。命中缓存时不调用处理函数，
+    请求携带匹配的 If-None-Match 时返回 304。缓存的响应仅保留 Content-Type 响应头。
+
+    Args:
+        cache (ResponseCache): 响应缓存
+        ttl (float): 缓存有效期（秒）
+        tags (Iterable[str], optional): 缓存标签，用于批量失效. Defaults to ().
+        tags_getter (Optional[Callable[[Request], Iterable[str]]], optional):
+            根据请求生成额外的缓存标签. Defaults to None.
+        compressor (Optional[Compressor], optional): 传入时按 Accept-Encoding
+            返回压缩后的响应体，压缩结果随缓存条目保存. Defaults to None.
+    """
+    static_tags = tuple(tags)
+
+    def outer(func: Callable[..., Any]) -> Callable[..., Awaitable[HTTPResponse]]:
+        @wraps(func)
+        async def inner(request: Request, *args: Any, **kwargs: Any) -> HTTPResponse:
+            key = make_cache_key(request.path, request.query_string)
+
+            entry = cache.get(key)
+            if entry:
+                return await _build_response(cache, key, entry, request, compressor)
+
+            response = func(request, *args, **kwargs)
+            if isawaitable(response):
+                response = await response
+
+            # 已压缩的响应体不能以其它编码返回
+            if (
+                response.status != 200
+                or response.body is None
+                or "Content-Encoding" in response.headers
+            ):
+                return response
+
+            entry = cache.set(
+                key,
+                response.body,
+                content_type=response.content_type or "",
+                ttl=ttl,
+                tags=static_tags + tuple(tags_getter(request) if tags_getter else ()),
+            )
+            if not entry:  # 响应体过大
+                return response
+
+            return await _build_response(cache, key, entry, request, compressor)
+
+        return inner
+
+    return outer
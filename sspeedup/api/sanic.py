@@ -1,5 +1,19 @@
 from functools import wraps
-from typing import Any, Callable, Dict, List, Literal, Optional, TypedDict
+from inspect import iscoroutinefunction
+from time import perf_counter
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    TypedDict,
+    Union,
+)
 
 from pydantic import BaseModel as _BaseModel
 from pydantic import ConfigDict, ValidationError
@@ -9,7 +23,9 @@ from sanic import BadRequest, HTTPResponse, Request
 from sanic.response import JSONResponse
 from ujson import dumps as _dumps
 
+from sspeedup.api._query_args import is_sequence_annotation, parse_query_args
 from sspeedup.api.code import Code, get_default_msg, is_ok
+from sspeedup.api.timing._base import record_api_code
 
 
 def _json_dumps(x: Dict) -> str:
@@ -35,6 +51,7 @@ class _ResponseType(TypedDict):
 def get_response_json(
     *, code: Code, msg: Optional[str] = None, data: Optional[Dict[str, Any]] = None
 ) -> JSONResponse:
+    record_api_code(code)
     body: _ResponseType = {
         "ok": is_ok(code),
         "code": code.value,
@@ -57,35 +74,69 @@ def _format_errors(errors: List[ErrorDetails]) -> str:
     return "\n".join(result)
 
 
+def _get_sequence_field_keys(model: _ModelMetaclass) -> Set[str]:
+    result: Set[str] = set()
+    for name, field in model.model_fields.items():  # type: ignore
+        if is_sequence_annotation(field.annotation):
+            result.add(name)
+            if field.alias:
+                result.add(field.alias)
+
+    return result
+
+
 def inject_pydantic_model(
     model: _ModelMetaclass, *, source: Literal["body", "query_args"] = "body"
 ) -> Callable:
+    sequence_keys = _get_sequence_field_keys(model) if source == "query_args" else set()
+
+    def validate(
+        request: Request,
+    ) -> Tuple[Optional[_BaseModel], Optional[JSONResponse]]:
+        start = perf_counter()
+        try:
+            if source == "body":
+                data = model.model_validate_json(request.body)  # type: ignore
+            else:
+                data = model.model_validate(  # type: ignore
+                    parse_query_args(request.args, sequence_keys)
+                )
+            return data, None
+        except BadRequest:
+            return None, get_response_json(code=Code.DESERIALIZE_FAILED)
+        except ValidationError as e:
+            return None, get_response_json(
+                code=Code.BAD_ARGUMENTS,
+                msg=_format_errors(e.errors(include_url=False, include_context=False)),
+            )
+        finally:
+            # 供耗时统计区分参数校验与处理函数
+            request.ctx.validation_time = perf_counter() - start
+
     def outer(
-        func: Callable[[Request, _BaseModel], HTTPResponse]
-    ) -> Callable[[Request], HTTPResponse]:
+        func: Callable[
+            [Request, _BaseModel], Union[HTTPResponse, Awaitable[HTTPResponse]]
+        ],
+    ) -> Callable[[Request], Union[HTTPResponse, Awaitable[HTTPResponse]]]:
+        if iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_inner(request: Request) -> HTTPResponse:
+                data, error_response = validate(request)
+                if error_response:
+                    return error_response
+
+                return await func(request, data)  # type: ignore
+
+            return async_inner
+
         @wraps(func)
         def inner(request: Request) -> HTTPResponse:
-            try:
-                if source == "body":
-                    data = model.model_validate_json(request.body)  # type: ignore
-                else:
-                    # 在 Query Args 规范中，每个 key 可以有多个 value
-                    # 故 request.args 返回的是 Dict[str, List[Any]] 形式的数据
-                    # 此处仅保留每个 key 的第一个 value
-                    data = model.model_validate(  # type: ignore
-                        {k: v[0] for k, v in request.args.items()}
-                    )
-            except BadRequest:
-                return get_response_json(code=Code.DESERIALIZE_FAILED)
-            except ValidationError as e:
-                return get_response_json(
-                    code=Code.BAD_ARGUMENTS,
-                    msg=_format_errors(
-                        e.errors(include_url=False, include_context=False)
-                    ),
-                )
-            else:
-                return func(request, data)
+            data, error_response = validate(request)
+            if error_response:
+                return error_response
+
+            return func(request, data)  # type: ignore
 
         return inner
 
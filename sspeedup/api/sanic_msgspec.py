@@ -0,0 +1,118 @@
+from functools import wraps
+from inspect import isawaitable
+from time import perf_counter
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Literal,
+    Optional,
+    Set,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from msgspec import DecodeError, Struct, ValidationError, convert
+from msgspec.json import Decoder
+from msgspec.structs import fields as struct_fields
+from sanic import HTTPResponse, Request
+
+# 请求与响应模型的配置在各框架的集成中共用，此处重新导出
+from sspeedup.api._msgspec import REQUEST_STRUCT_CONFIG as REQUEST_STRUCT_CONFIG
+from sspeedup.api._msgspec import RESPONSE_STRUCT_CONFIG as RESPONSE_STRUCT_CONFIG
+from sspeedup.api._msgspec import encode_envelope
+from sspeedup.api._query_args import is_sequence_annotation, parse_query_args
+from sspeedup.api.code import Code
+from sspeedup.api.timing._base import record_api_code
+
+_T = TypeVar("_T", bound=Struct)
+
+_HandlerReturn = Union[HTTPResponse, Awaitable[HTTPResponse]]
+
+
+# 每个请求模型的解码器仅在首次使用时创建一次
+_DECODERS: Dict[Type[Struct], Decoder] = {}
+
+
+def _get_decoder(struct: Type[Struct]) -> Decoder:
+    decoder = _DECODERS.get(struct)
+    if not decoder:
+        decoder = Decoder(struct)
+        _DECODERS[struct] = decoder
+
+    return decoder
+
+
+# 每个请求模型中列表类型字段的名称仅在首次使用时计算一次
+_SEQUENCE_FIELD_KEYS: Dict[Type[Struct], Set[str]] = {}
+
+
+def _get_sequence_field_keys(struct: Type[Struct]) -> Set[str]:
+    keys = _SEQUENCE_FIELD_KEYS.get(struct)
+    if keys is None:
+        keys = {
+            field.encode_name
+            for field in struct_fields(struct)
+            if is_sequence_annotation(field.type)
+        }
+        _SEQUENCE_FIELD_KEYS[struct] = keys
+
+    return keys
+
+
+def get_response_json(
+    *, code: Code, msg: Optional[str] = None, data: Any = None
+) -> HTTPResponse:
+    record_api_code(code)
+    return HTTPResponse(
+        encode_envelope(code, msg, data), content_type="application/json"
+    )
+
+
+def _format_error(error: ValidationError) -> str:
+    return f"数据校验失败：\n{error}"
+
+
+def inject_struct(
+    struct: Type[_T], *, source: Literal["body", "query_args"] = "body"
+) -> Callable:
+    decoder = _get_decoder(struct)
+    sequence_keys = (
+        _get_sequence_field_keys(struct) if source == "query_args" else set()
+    )
+
+    def outer(
+        func: Callable[[Request, _T], _HandlerReturn],
+    ) -> Callable[[Request], Awaitable[HTTPResponse]]:
+        @wraps(func)
+        async def inner(request: Request) -> HTTPResponse:
+            start = perf_counter()
+            try:
+                if source == "body":
+                    data = decoder.decode(request.body)
+                else:
+                    # 非严格模式下，字符串形式的数字、布尔值等会被转换为对应类型
+                    data = convert(
+                        parse_query_args(request.args, sequence_keys),
+                        type=struct,
+                        strict=False,
+                    )
+            # ValidationError 是 DecodeError 的子类，需先行处理
+            except ValidationError as e:
+                return get_response_json(code=Code.BAD_ARGUMENTS, msg=_format_error(e))
+            except DecodeError:
+                return get_response_json(code=Code.DESERIALIZE_FAILED)
+            finally:
+                # 供耗时统计区分参数校验与处理函数
+                request.ctx.validation_time = perf_counter() - start
+
+            result = func(request, data)
+            if isawaitable(result):
+                return await result
+            return result
+
+        return inner
+
+    return outer
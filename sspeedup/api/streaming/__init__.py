@@ -0,0 +1 @@
+from sspeedup.api.streaming._base import StreamFormat, iter_envelope_chunks
@@ -0,0 +1,69 @@
+from typing import Any, AsyncGenerator, AsyncIterable, Literal, Optional
+
+from msgspec.json import Encoder
+
+from sspeedup.api._msgspec import encode_envelope_header
+from sspeedup.api.code import Code
+
+StreamFormat = Literal["ndjson", "json_array"]
+
+_ENCODER = Encoder()
+
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "json_array": "application/json",
+}
+
+
+async def iter_envelope_chunks(
+    items: AsyncIterable[Any],
+    *,
+    api_code: Code = Code.SUCCESS,
+    msg: Optional[str] = None,
+    format: StreamFormat = "ndjson",  # noqa: A002
+    chunk_size: int = 64 * 1024,
+) -> AsyncGenerator[bytes, None]:
+    """将数据逐项编码为带有响应信封的字节块
+
+    ndjson 格式中，首行为不含 data 字段的信封，之后每行一项数据；
+    json_array 格式与 ResponseStruct 的编码结果一致，data 为数组。
+
+    数据累积到 chunk_size 字节后输出一个块，内存占用与数据总量无关。
+
+    Args:
+        items (AsyncIterable[Any]): 数据，通常为 Struct 的异步迭代器
+        api_code (Code, optional): 错误码. Defaults to Code.SUCCESS.
+        msg (Optional[str], optional): 信息，默认使用错误码对应的信息. Defaults to None.
+        format (StreamFormat, optional): 输出格式. Defaults to "ndjson".
+        chunk_size (int, optional): 块大小（字节）. Defaults to 64 * 1024.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size 必须大于 0")
+
+    header = encode_envelope_header(api_code, msg)
+    if format == "ndjson":
+        buffer = bytearray(header + b"\n")
+        item_prefix, data_suffix = b"", b""
+    else:
+        # 去掉结尾的括号，之后接上 data 字段
+        buffer = bytearray(header[:-1] + b',"data":[')
+        item_prefix, data_suffix = b",", b"]}"
+
+    is_first = True
+    async for item in items:
+        if is_first:
+            is_first = False
+        else:
+            buffer += item_prefix
+        _ENCODER.encode_into(item, buffer, -1)
+        if format == "ndjson":
+            buffer += b"\n"
+
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+
+    buffer += data_suffix
+    if buffer:
+        yield bytes(buffer)
@@ -0,0 +1,32 @@
+from typing import Any, AsyncIterable, Optional
+
+from litestar.response import Stream
+from litestar.status_codes import HTTP_200_OK
+
+from sspeedup.api.code import Code
+from sspeedup.api.streaming._base import (
+    MEDIA_TYPES,
+    StreamFormat,
+    iter_envelope_chunks,
+)
+from sspeedup.api.timing._base import record_api_code
+
+
+def stream_success(
+    items: AsyncIterable[Any],
+    *,
+    http_code: int = HTTP_200_OK,
+    api_code: Code = Code.SUCCESS,
+    msg: Optional[str] = None,
+    format: StreamFormat = "ndjson",  # noqa: A002
+    chunk_size: int = 64 * 1024,
+) -> Stream:
+    """以流式响应返回大量数据，数据在发送时才从 items 中读取"""
+    record_api_code(api_code)
+    return Stream(
+        iter_envelope_chunks(
+            items, api_code=api_code, msg=msg, format=format, chunk_size=chunk_size
+        ),
+        status_code=http_code,
+        media_type=MEDIA_TYPES[format],
+    )
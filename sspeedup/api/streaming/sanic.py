@@ -0,0 +1,33 @@
+from typing import Any, AsyncIterable, Optional
+
+from sanic import Request
+
+from sspeedup.api.code import Code
+from sspeedup.api.streaming._base import (
+    MEDIA_TYPES,
+    StreamFormat,
+    iter_envelope_chunks,
+)
+from sspeedup.api.timing._base import record_api_code
+
+
+async def stream_success(
+    request: Request,
+    items: AsyncIterable[Any],
+    *,
+    api_code: Code = Code.SUCCESS,
+    msg: Optional[str] = None,
+    format: StreamFormat = "ndjson",  # noqa: A002
+    chunk_size: int = 64 * 1024,
+) -> None:
+    """以流式响应返回大量数据，调用后处理函数无需再返回响应
+
+    每个块在发送完成后才读取下一批数据，客户端接收缓慢时不会在内存中堆积数据。
+    """
+    record_api_code(api_code)
+    response = await request.respond(content_type=MEDIA_TYPES[format])
+    async for chunk in iter_envelope_chunks(
+        items, api_code=api_code, msg=msg, format=format, chunk_size=chunk_size
+    ):
+        await response.send(chunk)
+    await response.eof()
@@ -0,0 +1,7 @@
+from sspeedup.api.timing._base import (
+    DEFAULT_BUCKETS,
+    Histogram,
+    HistogramSnapshot,
+    TimingRecorder,
+    record_api_code,
+)
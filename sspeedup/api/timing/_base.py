@@ -0,0 +1,146 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 各阶段含义：
+# pre_handler：参数解析前（路由、中间件、请求钩子）
+# validation：参数解析、校验与依赖注入
+# handler：处理函数本身
+# post_handler：处理函数返回后（响应序列化）
+# total：完整请求
+Stage = str
+
+# 单位为毫秒，最后一个桶收集超过所有边界的样本
+DEFAULT_BUCKETS: Tuple[float, ...] = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+
+
+@dataclass(frozen=True)
+class HistogramSnapshot:
+    buckets: Tuple[float, ...]
+    counts: Tuple[int, ...]
+    count: int
+    sum: float
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0
+
+    def percentile(self, percentile: float) -> float:
+        """估算百分位数，返回所在桶的上界，落在最后一个桶时返回 inf"""
+        if not self.count:
+            return 0
+
+        target = self.count * percentile / 100
+        accumulated = 0
+        for bucket, count in zip(self.buckets, self.counts):
+            accumulated += count
+            if accumulated >= target:
+                return bucket
+
+        return float("inf")
+
+
+class Histogram:
+    __slots__ = ("_buckets", "_counts", "_count", "_sum")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self._buckets = tuple(buckets)
+        self._counts: List[int] = [0] * (len(self._buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self._buckets, value)] += 1
+        self._count += 1
+        self._sum += value
+
+    def snapshot(self) -> HistogramSnapshot:
+        return HistogramSnapshot(
+            buckets=self._buckets,
+            counts=tuple(self._counts),
+            count=self._count,
+            sum=self._sum,
+        )
+
+
+class TimingRecorder:
+    """按路由、错误码与阶段记录请求耗时"""
+
+    def __init__(self, *, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self._buckets = tuple(buckets)
+        self._histograms: Dict[Tuple[str, Optional[int], Stage], Histogram] = {}
+        self._lock = Lock()
+
+    def observe(
+        self, route: str, code: Optional[int], stages: Dict[Stage, float]
+    ) -> None:
+        """记录一次请求，stages 中的耗时单位为秒"""
+        with self._lock:
+            for stage, seconds in stages.items():
+                key = (route, code, stage)
+                histogram = self._histograms.get(key)
+                if not histogram:
+                    histogram = Histogram(self._buckets)
+                    self._histograms[key] = histogram
+
+                histogram.observe(seconds * 1000)
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[Stage, HistogramSnapshot]]]:
+        """返回 {路由: {错误码: {阶段: 直方图}}}，无法识别错误码时为 unknown"""
+        with self._lock:
+            items = [(key, x.snapshot()) for key, x in self._histograms.items()]
+
+        result: Dict[str, Dict[str, Dict[Stage, HistogramSnapshot]]] = {}
+        for (route, code, stage), histogram in items:
+            code_key = str(code) if code is not None else "unknown"
+            result.setdefault(route, {}).setdefault(code_key, {})[stage] = histogram
+
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+# 当前请求的错误码，由耗时统计中间件创建，响应辅助函数写入
+# 在响应编码与压缩前记录，不依赖最终发送的响应体
+_API_CODES: ContextVar[Optional[List[int]]] = ContextVar(
+    "sspeedup_timing_api_codes", default=None
+)
+
+
+def record_api_code(code: int) -> None:
+    """记录当前请求的错误码，未启用耗时统计时不做任何事"""
+    codes = _API_CODES.get()
+    if codes is not None:
+        codes.append(code)
+
+
+def extract_api_code(body: bytes) -> Optional[int]:
+    """从响应信封中读取错误码，响应体不是信封格式时返回 None
+
+    仅用于未通过响应辅助函数构建的响应，响应体需未经压缩。
+    """
+    if not body.startswith(b'{"ok":'):
+        return None
+
+    start = body.find(b',"code":', 6, 20)
+    if start == -1:
+        return None
+    start += 8
+    end = body.find(b",", start, start + 8)
+    if end == -1:
+        return None
+
+    try:
+        return int(body[start:end])
+    except ValueError:
+        return None
+
+
+def format_server_timing(stages: Dict[Stage, float]) -> str:
+    return ", ".join(
+        f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in stages.items()
+    )
@@ -0,0 +1,242 @@
+from contextvars import ContextVar
+from inspect import isawaitable
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+from weakref import WeakSet
+
+from litestar import Litestar, Request, Response, get
+from litestar.config.app import AppConfig
+from litestar.datastructures import MutableScopeHeaders
+from litestar.enums import ScopeType
+from litestar.handlers import HTTPRouteHandler
+from litestar.plugins import InitPluginProtocol
+from litestar.routes import HTTPRoute
+from litestar.types import (
+    ASGIApp,
+    BeforeRequestHookHandler,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
+
+from sspeedup.api.litestar import success
+from sspeedup.api.timing._base import (
+    _API_CODES,
+    Stage,
+    TimingRecorder,
+    extract_api_code,
+    format_server_timing,
+)
+
+# 当前请求的各时间点，由中间件创建，请求钩子与处理函数写入
+_MARKS: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "sspeedup_timing_marks", default=None
+)
+
+# HTTPRouteHandler 中保存处理函数的属性
+_HANDLER_FN_ATTRIBUTE = "_fn"
+
+# 已包装的处理函数，避免多次启动时重复包装
+_WRAPPED_FNS: "WeakSet[Callable[..., Any]]" = WeakSet()
+
+
+def _get_stages(marks: Dict[str, float], end: float) -> Dict[Stage, float]:
+    start = marks["start"]
+    handler_start = marks.get("handler_start")
+    fn_start = marks.get("fn_start")
+    fn_end = marks.get("fn_end")
+    response_start = marks.get("response_start")
+
+    stages: Dict[Stage, float] = {}
+    if not fn_start and handler_start:
+        # 未能包装处理函数时，参数解析计入 handler
+        stages["pre_handler"] = handler_start - start
+        if response_start:
+            stages["handler"] = response_start - handler_start
+    elif fn_start:
+        # 路由自行设置 before_request 钩子时无法区分，参数解析计入 pre_handler
+        if handler_start:
+            stages["pre_handler"] = handler_start - start
+            stages["validation"] = fn_start - handler_start
+        else:
+            stages["pre_handler"] = fn_start - start
+        if fn_end:
+            stages["handler"] = fn_end - fn_start
+            if response_start:
+                stages["post_handler"] = response_start - fn_end
+    stages["total"] = end - start
+
+    return stages
+
+
+def _chain_before_request(
+    original: Optional[BeforeRequestHookHandler],
+) -> BeforeRequestHookHandler:
+    async def before_request(request: Request) -> Any:
+        marks = _MARKS.get()
+        if marks is not None:
+            marks["handler_start"] = perf_counter()
+
+        if not original:
+            return None
+        result = original(request)
+        return await result if isawaitable(result) else result
+
+    return before_request
+
+
+def _wrap_handler_fn(route_handler: HTTPRouteHandler) -> None:
+    # Litestar 未提供参数解析完成后的钩子，只能替换处理函数
+    # 内部属性不存在时不做修改，参数解析耗时计入 handler 阶段
+    if not hasattr(route_handler, _HANDLER_FN_ATTRIBUTE):
+        return
+    fn = route_handler.fn
+    if fn in _WRAPPED_FNS:
+        return
+
+    # 参数解析完成后才会调用处理函数，在此记录处理函数的起止时间
+    if route_handler.has_sync_callable:
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            marks = _MARKS.get()
+            if marks is not None:
+                marks["fn_start"] = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                if marks is not None:
+                    marks["fn_end"] = perf_counter()
+
+    else:
+
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:  # type: ignore
+            marks = _MARKS.get()
+            if marks is not None:
+                marks["fn_start"] = perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                if marks is not None:
+                    marks["fn_end"] = perf_counter()
+
+    try:
+        setattr(route_handler, _HANDLER_FN_ATTRIBUTE, wrapper)
+    except AttributeError:
+        return
+    _WRAPPED_FNS.add(wrapper)
+
+
+class TimingPlugin(InitPluginProtocol):
+    """按路由与错误码记录请求各阶段的耗时
+
+    validation 为参数解析、校验与依赖注入，post_handler 为响应序列化。
+    路由自行设置 before_request 钩子时，该路由的参数解析计入 pre_handler。
+    错误码由 success / fail 等响应辅助函数在编码前记录，不受响应压缩影响。
+    """
+
+    def __init__(
+        self,
+        recorder: TimingRecorder,
+        *,
+        server_timing: bool = False,
+        stats_path: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            recorder (TimingRecorder): 耗时记录器
+            server_timing (bool, optional): 是否添加 Server-Timing 响应头.
+                Defaults to False.
+            stats_path (Optional[str], optional): 统计数据接口路径，为 None 时不注册.
+                Defaults to None.
+        """
+        self._recorder = recorder
+        self._server_timing = server_timing
+        self._stats_path = stats_path
+        # 处理函数的 id 到路由路径的映射，带有路径参数的路由只记录一个统计项
+        self._route_paths: Dict[int, str] = {}
+
+    def _on_startup(self, app: Litestar) -> None:
+        paths: Dict[int, List[str]] = {}
+        for route in app.routes:
+            if not isinstance(route, HTTPRoute):
+                continue
+
+            for route_handler in route.route_handlers:
+                _wrap_handler_fn(route_handler)
+                paths.setdefault(id(route_handler), []).append(route.path)
+
+        # 同一处理函数注册到多个路径时，合并为一个统计项
+        self._route_paths.update(
+            {key: " | ".join(sorted(value)) for key, value in paths.items()}
+        )
+
+    def _middleware_factory(self, app: ASGIApp) -> ASGIApp:
+        recorder = self._recorder
+        server_timing = self._server_timing
+        route_paths = self._route_paths
+
+        async def middleware(scope: Scope, receive: Receive, send: Send) -> None:
+            if scope["type"] != ScopeType.HTTP:
+                await app(scope, receive, send)
+                return
+
+            marks: Dict[str, float] = {"start": perf_counter()}
+            token = _MARKS.set(marks)
+            codes: List[int] = []
+            codes_token = _API_CODES.set(codes)
+            body_code: Optional[int] = None
+            is_first_body = True
+            is_encoded = False
+
+            async def timing_send(message: Message) -> None:
+                nonlocal body_code, is_first_body, is_encoded
+
+                if message["type"] == "http.response.start":
+                    marks["response_start"] = perf_counter()
+                    headers = MutableScopeHeaders.from_message(message)
+                    is_encoded = "content-encoding" in headers
+                    if server_timing:
+                        headers["Server-Timing"] = format_server_timing(
+                            _get_stages(marks, marks["response_start"])
+                        )
+                elif message["type"] == "http.response.body" and is_first_body:
+                    is_first_body = False
+                    # 未通过响应辅助函数构建的响应，从未压缩的响应体中读取
+                    if not codes and not is_encoded:
+                        body_code = extract_api_code(message.get("body", b""))
+
+                await send(message)
+
+            try:
+                await app(scope, receive, timing_send)
+            finally:
+                _MARKS.reset(token)
+                _API_CODES.reset(codes_token)
+                code = codes[-1] if codes else body_code
+                route_handler = scope.get("route_handler")
+                path = (
+                    route_paths.get(id(route_handler), "<unmatched>")
+                    if route_handler
+                    else "<unmatched>"
+                )
+                route = f"{scope['method']} {path}"
+                recorder.observe(route, code, _get_stages(marks, perf_counter()))
+
+        return middleware
+
+    def on_app_init(self, app_config: AppConfig) -> AppConfig:
+        app_config.middleware.insert(0, self._middleware_factory)
+        app_config.before_request = _chain_before_request(app_config.before_request)
+        app_config.on_startup.append(self._on_startup)
+
+        if self._stats_path:
+            recorder = self._recorder
+
+            @get(self._stats_path, include_in_schema=False, sync_to_thread=False)
+            def timing_stats() -> Response:
+                return success(data=recorder.snapshot())
+
+            app_config.route_handlers.append(timing_stats)
+
+        return app_config
@@ -0,0 +1,127 @@
+from dataclasses import asdict
+from time import perf_counter
+from typing import Dict, Optional
+
+from sanic import HTTPResponse, Request, Sanic
+
+from sspeedup.api.code import Code
+from sspeedup.api.sanic import get_response_json
+from sspeedup.api.timing._base import (
+    _API_CODES,
+    Stage,
+    TimingRecorder,
+    extract_api_code,
+    format_server_timing,
+)
+
+
+def _get_stages(
+    marks: Dict[str, float], end: float, validation_time: Optional[float]
+) -> Dict[Stage, float]:
+    start = marks["start"]
+    handler_start = marks.get("handler_start")
+    handler_end = marks.get("handler_end")
+
+    stages: Dict[Stage, float] = {}
+    if handler_start:
+        stages["pre_handler"] = handler_start - start
+        if handler_end:
+            # 参数校验在处理函数的装饰器内完成，从 handler 阶段中扣除
+            if validation_time is not None:
+                stages["validation"] = validation_time
+            stages["handler"] = handler_end - handler_start - (validation_time or 0)
+            stages["post_handler"] = end - handler_end
+    stages["total"] = end - start
+
+    return stages
+
+
+def setup_timing(
+    app: Sanic,
+    recorder: TimingRecorder,
+    *,
+    server_timing: bool = False,
+    stats_uri: Optional[str] = None,
+) -> None:
+    """按路由与错误码记录请求各阶段的耗时
+
+    使用 inject_pydantic_model / inject_struct 装饰的处理函数，参数解析与校验耗时
+    单独记录为 validation 阶段；响应编码在处理函数内完成，计入 handler 阶段。
+    错误码由 get_response_json 在编码前记录，不受响应压缩影响。
+
+    Args:
+        app (Sanic): Sanic 应用
+        recorder (TimingRecorder): 耗时记录器
+        server_timing (bool, optional): 是否添加 Server-Timing 响应头.
+            Defaults to False.
+        stats_uri (Optional[str], optional): 统计数据接口路径，为 None 时不注册.
+            Defaults to None.
+    """
+
+    async def on_request(request: Request) -> None:
+        request.ctx.timing_marks = {"start": perf_counter()}
+        request.ctx.timing_api_codes = []
+        # 请求中间件与处理函数在同一上下文中执行，响应辅助函数可写入错误码
+        _API_CODES.set(request.ctx.timing_api_codes)
+
+    async def on_handler_before(request: Request) -> None:
+        marks = getattr(request.ctx, "timing_marks", None)
+        if marks is not None:
+            marks["handler_start"] = perf_counter()
+
+    async def on_handler_after(request: Request) -> None:
+        marks = getattr(request.ctx, "timing_marks", None)
+        if marks is not None:
+            marks["handler_end"] = perf_counter()
+
+    async def on_response(request: Request, response: HTTPResponse) -> None:
+        marks = getattr(request.ctx, "timing_marks", None)
+        if marks is None:
+            return
+
+        stages = _get_stages(
+            marks, perf_counter(), getattr(request.ctx, "validation_time", None)
+        )
+        if server_timing:
+            response.headers["Server-Timing"] = format_server_timing(stages)
+
+        # 未匹配路由的请求统一记录，避免路由数量无限增长
+        route = (
+            f"{request.method} /{request.route.path}"
+            if request.route
+            else f"{request.method} <unmatched>"
+        )
+        codes = request.ctx.timing_api_codes
+        if codes:
+            code: Optional[int] = codes[-1]
+        elif response.body and "Content-Encoding" not in response.headers:
+            # 未通过响应辅助函数构建的响应，从未压缩的响应体中读取
+            code = extract_api_code(response.body)
+        else:
+            code = None
+        recorder.observe(route, code, stages)
+
+    # 尽可能早地开始计时
+    app.register_middleware(on_request, "request", priority=1000)
+    app.register_middleware(on_response, "response")
+    app.signal("http.handler.before")(on_handler_before)
+    app.signal("http.handler.after")(on_handler_after)
+
+    if stats_uri:
+
+        def timing_stats(_: Request) -> HTTPResponse:
+            return get_response_json(
+                code=Code.SUCCESS,
+                data={
+                    route: {
+                        code: {
+                            stage: asdict(histogram)
+                            for stage, histogram in stages.items()
+                        }
+                        for code, stages in codes.items()
+                    }
+                    for route, codes in recorder.snapshot().items()
+                },
+            )
+
+        app.add_route(timing_stats, stats_uri, methods=["GET"])
@@ -0,0 +1,87 @@
+from asyncio import (
+    AbstractEventLoop,
+    get_running_loop,
+    new_event_loop,
+    run_coroutine_threadsafe,
+)
+from atexit import register as atexit_register
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+_T = TypeVar("_T")
+
+_LOOP: Optional[AbstractEventLoop] = None
+_LOOP_THREAD: Optional[Thread] = None
+_LOOP_LOCK = Lock()
+
+
+def _has_running_loop() -> bool:
+    try:
+        get_running_loop()
+    except RuntimeError:
+        return False
+
+    return True
+
+
+def get_background_loop() -> AbstractEventLoop:
+    """获取在后台线程中长期运行的事件循环，首次调用时启动
+
+    在此循环中创建的异步客户端（如 httpx.AsyncClient、Motor）可在多次调用间复用连接池。
+    """
+    global _LOOP, _LOOP_THREAD
+
+    if _LOOP:
+        return _LOOP
+
+    with _LOOP_LOCK:
+        if not _LOOP:
+            loop = new_event_loop()
+            thread = Thread(
+                target=loop.run_forever, name="async-to-sync-loop", daemon=True
+            )
+            thread.start()
+            _LOOP, _LOOP_THREAD = loop, thread
+
+        return _LOOP
+
+
+def submit_to_background_loop(
+    func: Callable[..., Awaitable[_T]], *args: Any, **kwargs: Any
+) -> "Future[_T]":
+    async def run() -> _T:
+        return await func(*args, **kwargs)
+
+    return run_coroutine_threadsafe(run(), get_background_loop())
+
+
+def async_to_sync(
+    func: Callable[..., Awaitable[_T]], *args: Any, **kwargs: Any
+) -> _T:
+    # 在事件循环中阻塞等待会导致该循环卡死，后台循环中调用则会直接死锁
+    if _has_running_loop():
+        raise RuntimeError("不能在运行中的事件循环内调用 async_to_sync")
+
+    return submit_to_background_loop(func, *args, **kwargs).result()
+
+
+def stop_background_loop(*, timeout: Optional[float] = 5) -> None:
+    global _LOOP, _LOOP_THREAD
+
+    with _LOOP_LOCK:
+        loop, thread = _LOOP, _LOOP_THREAD
+        _LOOP, _LOOP_THREAD = None, None
+
+    if not loop or not thread:
+        return
+
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout)
+    if not thread.is_alive():
+        loop.close()
+
+
+atexit_register(stop_background_loop)
@@ -1,13 +1,55 @@
+from contextlib import suppress
+from hashlib import blake2b
+from os import fdopen, replace, stat, unlink
+from os.path import basename, dirname, join
 from signal import SIG_DFL, SIGHUP, signal
-from typing import Callable, Optional, Type, TypeVar
+from tempfile import mkstemp
+from typing import Callable, Dict, Optional, Tuple, Type, TypeVar
 
-from msgspec import Struct
+from msgspec import DecodeError, Raw, Struct
+from msgspec.inspect import type_info
+from msgspec.msgpack import Decoder as MsgpackDecoder
+from msgspec.msgpack import Encoder as MsgpackEncoder
 from msgspec.yaml import decode as decode_yaml
 from msgspec.yaml import encode as encode_yaml
 
 _T = TypeVar("_T")
 
 
+class _ConfigSnapshot(Struct, array_like=True, frozen=True):
+    # 配置类结构的指纹，配置类修改后缓存失效
+    class_fingerprint: str
+    mtime_ns: int
+    size: int
+    digest: bytes
+    data: Raw
+
+
+_SNAPSHOT_ENCODER = MsgpackEncoder()
+_SNAPSHOT_DECODER = MsgpackDecoder(_ConfigSnapshot)
+
+# 配置类 -> (结构指纹, msgpack 解码器)，每个配置类仅在首次加载时创建一次
+_DECODERS: Dict[type, Tuple[str, MsgpackDecoder]] = {}
+
+
+def _get_decoder(config_class: type) -> Tuple[str, MsgpackDecoder]:
+    result = _DECODERS.get(config_class)
+    if not result:
+        fingerprint = blake2b(
+            f"{config_class.__module__}.{config_class.__qualname__}:"
+            f"{type_info(config_class)!r}".encode(),
+            digest_size=16,
+        ).hexdigest()
+        result = (fingerprint, MsgpackDecoder(config_class))
+        _DECODERS[config_class] = result
+
+    return result
+
+
+def _get_snapshot_file_name(file_name: str) -> str:
+    return join(dirname(file_name), f".{basename(file_name)}.snapshot")
+
+
 def _save_default_config(
     config_class: Type[Struct], *, file_name: str = "config.yaml"
 ) -> None:
@@ -15,16 +57,109 @@ def _save_default_config(
         f.write(encode_yaml(config_class()))
 
 
-def _load_config(config_class: Type[_T], *, file_name: str = "config.yaml") -> _T:
+def _load_config_from_snapshot(
+    config_class: Type[_T], *, file_name: str, data: bytes, mtime_ns: int
+) -> Optional[_T]:
+    fingerprint, decoder = _get_decoder(config_class)
+    try:
+        with open(_get_snapshot_file_name(file_name), "rb") as f:
+            snapshot = _SNAPSHOT_DECODER.decode(f.read())
+    except (OSError, DecodeError):
+        return None
+
+    if (
+        snapshot.class_fingerprint != fingerprint
+        or snapshot.mtime_ns != mtime_ns
+        or snapshot.size != len(data)
+        # 修改时间相同时仍需比较内容，避免时间精度不足导致读取到旧配置
+        or snapshot.digest != blake2b(data, digest_size=16).digest()
+    ):
+        return None
+
+    try:
+        return decoder.decode(snapshot.data)
+    except DecodeError:
+        return None
+
+
+def _save_snapshot(
+    config: object, *, config_class: type, file_name: str, data: bytes, mtime_ns: int
+) -> None:
+    fingerprint, _ = _get_decoder(config_class)
+    snapshot = _ConfigSnapshot(
+        class_fingerprint=fingerprint,
+        mtime_ns=mtime_ns,
+        size=len(data),
+        digest=blake2b(data, digest_size=16).digest(),
+        data=Raw(_SNAPSHOT_ENCODER.encode(config)),
+    )
+
+    snapshot_file_name = _get_snapshot_file_name(file_name)
+    # 缓存仅用于加速，无法写入（如只读文件系统）时忽略
+    with suppress(OSError):
+        # 缓存中包含配置中的密钥等内容，临时文件权限为 0600，且文件名随机，
+        # 多个进程同时写入时互不影响
+        fd, temp_file_name = mkstemp(
+            prefix=f"{basename(snapshot_file_name)}.",
+            suffix=".tmp",
+            dir=dirname(snapshot_file_name) or ".",
+        )
+        try:
+            with fdopen(fd, "wb") as f:
+                f.write(_SNAPSHOT_ENCODER.encode(snapshot))
+            # 替换是原子操作，其它进程不会读取到写入一半的缓存
+            replace(temp_file_name, snapshot_file_name)
+        except OSError:
+            unlink(temp_file_name)
+            raise
+
+
+def _load_config(
+    config_class: Type[_T],
+    *,
+    file_name: str = "config.yaml",
+    snapshot_cache: bool = False,
+) -> _T:
+    if not snapshot_cache:
+        with open(file_name, "rb") as f:
+            return decode_yaml(f.read(), type=config_class)
+
     with open(file_name, "rb") as f:
-        return decode_yaml(f.read(), type=config_class)
+        mtime_ns = stat(f.fileno()).st_mtime_ns
+        data = f.read()
+
+    config = _load_config_from_snapshot(
+        config_class, file_name=file_name, data=data, mtime_ns=mtime_ns
+    )
+    if config is None:
+        config = decode_yaml(data, type=config_class)
+        _save_snapshot(
+            config,
+            config_class=config_class,
+            file_name=file_name,
+            data=data,
+            mtime_ns=mtime_ns,
+        )
+
+    return config
 
 
 def load_or_save_default_config(
-    config_class: Type[_T], *, file_name: str = "config.yaml"
+    config_class: Type[_T],
+    *,
+    file_name: str = "config.yaml",
+    snapshot_cache: bool = False,
 ) -> _T:
+    """加载配置文件，文件不存在时创建默认配置文件并退出
+
+    snapshot_cache 为 True 时，解析结果以 msgpack 格式缓存在配置文件所在目录
+    （仅当前用户可读写），配置文件与配置类均未修改时直接读取缓存，无需再次解析 YAML。
+    缓存文件包含完整的配置内容，默认不开启。
+    """
     try:
-        return _load_config(config_class, file_name=file_name)
+        return _load_config(
+            config_class, file_name=file_name, snapshot_cache=snapshot_cache
+        )
     except FileNotFoundError:
         _save_default_config(config_class, file_name=file_name)
         print("已自动创建配置文件，请完成配置后重新运行...")
@@ -35,12 +170,15 @@ def set_reload_on_sighup(
     config_class: Type[_T],
     *,
     file_name: str = "config.yaml",
+    snapshot_cache: bool = False,
     success_callback: Optional[Callable[[_T], None]] = None,
     failed_callback: Optional[Callable[[Exception], None]] = None,
 ) -> None:
     def handler(_, __) -> None:  # noqa: ANN001
         try:
-            new_config = _load_config(config_class, file_name=file_name)
+            new_config = _load_config(
+                config_class, file_name=file_name, snapshot_cache=snapshot_cache
+            )
         except Exception as e:
             if failed_callback:
                 failed_callback(e)
@@ -1,4 +1,4 @@
-from typing import Any, Dict, Literal
+from typing import Any, Dict, Literal, Optional, Tuple
 
 from msgspec import Struct
 
@@ -15,6 +15,18 @@ class MongoDBConfig(Struct, **CONFIG_STRUCT_CONFIG):
     host: str = "localhost"
     port: int = 27017
     database: str = ""
+    # 连接池，参数含义与 PyMongo 相同
+    max_pool_size: int = 100
+    min_pool_size: int = 0
+    max_idle_time_ms: Optional[int] = None
+    # 连接池耗尽时等待可用连接的超时时间，为空时一直等待
+    wait_queue_timeout_ms: Optional[int] = None
+    connect_timeout_ms: int = 20000
+    server_selection_timeout_ms: int = 30000
+    socket_timeout_ms: Optional[int] = None
+    # 按优先级排列，需服务端同时支持
+    compressors: Tuple[Literal["zstd", "snappy", "zlib"], ...] = ()
+    zlib_compression_level: int = -1
 
 
 class DeployConfig(Struct, **CONFIG_STRUCT_CONFIG):
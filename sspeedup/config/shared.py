@@ -0,0 +1,199 @@
+from atexit import register as atexit_register
+from contextlib import suppress
+from mmap import ACCESS_READ, mmap
+from os import O_CREAT, O_EXCL, O_RDWR, environ, fdopen, getpid, unlink
+from os import open as os_open
+from struct import pack_into, unpack_from
+from tempfile import mkstemp
+from threading import Lock
+from time import sleep
+from typing import Generic, Optional, Type, TypeVar
+
+from msgspec import Struct
+from msgspec.msgpack import Decoder, Encoder
+
+from sspeedup.config import _load_config
+
+_T = TypeVar("_T", bound=Struct)
+
+# 子进程通过该环境变量获取共享内存文件路径
+SHARED_CONFIG_ENV_NAME = "SSPEEDUP_SHARED_CONFIG"
+
+# 共享内存布局：序列号（写入期间为奇数）、版本号、数据长度，之后为 msgpack 数据
+_HEADER_FORMAT = "<QQI"
+_HEADER_SIZE = 24
+_SEQUENCE_OFFSET = 0
+_VERSION_OFFSET = 8
+_MAX_READ_RETRIES = 1000
+
+_ENCODER = Encoder()
+
+
+class SharedConfigPublisher(Generic[_T]):
+    """在主进程中将配置写入共享内存，供工作进程读取
+
+    配置写入临时目录中仅当前用户可读写的文件，各进程通过 mmap 映射同一块内存。
+    创建后会设置环境变量，之后创建的子进程可直接通过 SharedConfigReader 读取配置。
+    文件仅在创建它的进程退出时删除，fork 出的子进程退出时不会删除。
+    配置文件重新加载后调用 publish 即可将新配置发布到所有工作进程，例如：
+
+        set_reload_on_sighup(Config, success_callback=publisher.publish)
+    """
+
+    def __init__(
+        self,
+        config_class: Type[_T],
+        *,
+        file_name: str = "config.yaml",
+        size: int = 64 * 1024,
+        path: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            config_class (Type[_T]): 配置类
+            file_name (str, optional): 配置文件路径. Defaults to "config.yaml".
+            size (int, optional): 共享内存大小（字节），需大于编码后的配置.
+                Defaults to 64 * 1024.
+            path (Optional[str], optional): 共享内存文件路径，文件不能已存在，
+                为空时在临时目录中创建随机命名的文件. Defaults to None.
+        """
+        if size <= _HEADER_SIZE:
+            raise ValueError(f"size 必须大于 {_HEADER_SIZE}")
+
+        self._config_class = config_class
+        self._file_name = file_name
+        self._lock = Lock()
+
+        # 以独占方式创建，权限为 0600，路径已存在（包括符号链接）时失败
+        if path:
+            fd = os_open(path, O_RDWR | O_CREAT | O_EXCL, 0o600)
+        else:
+            fd, path = mkstemp(prefix="sspeedup-config-")
+        self._path = path
+        with fdopen(fd, "wb+") as f:
+            f.truncate(size)
+            self._buf = mmap(f.fileno(), size)
+        environ[SHARED_CONFIG_ENV_NAME] = self._path
+
+        # fork 出的子进程会继承退出时的回调，仅创建文件的进程可以删除文件
+        self._owner_pid = getpid()
+        atexit_register(self.close)
+
+        self._version = 0
+        self.publish(_load_config(config_class, file_name=file_name))
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def publish(self, config: _T) -> int:
+        """发布新配置
+
+        Returns:
+            int: 新配置的版本号
+        """
+        data = _ENCODER.encode(config)
+        if len(data) > len(self._buf) - _HEADER_SIZE:
+            raise ValueError("编码后的配置超过共享内存大小，请增大 size")
+
+        with self._lock:
+            buf = self._buf
+            sequence = unpack_from("<Q", buf, _SEQUENCE_OFFSET)[0]
+
+            # 序列号为奇数时，读取方会等待写入完成
+            pack_into("<Q", buf, _SEQUENCE_OFFSET, sequence + 1)
+            buf[_HEADER_SIZE : _HEADER_SIZE + len(data)] = data
+            self._version += 1
+            pack_into(_HEADER_FORMAT, buf, 0, sequence + 1, self._version, len(data))
+            pack_into("<Q", buf, _SEQUENCE_OFFSET, sequence + 2)
+
+        return self._version
+
+    def reload(self) -> int:
+        """重新读取配置文件并发布
+
+        Returns:
+            int: 新配置的版本号
+        """
+        return self.publish(_load_config(self._config_class, file_name=self._file_name))
+
+    def close(self) -> None:
+        if not self._buf.closed:
+            self._buf.close()
+
+        if getpid() != self._owner_pid:
+            return
+
+        if environ.get(SHARED_CONFIG_ENV_NAME) == self._path:
+            del environ[SHARED_CONFIG_ENV_NAME]
+        with suppress(FileNotFoundError):
+            unlink(self._path)
+
+
+class SharedConfigReader(Generic[_T]):
+    """在工作进程中读取主进程发布的配置
+
+    读取 config 属性时仅比较版本号，版本变化时才重新解码。
+    """
+
+    def __init__(self, config_class: Type[_T], *, path: Optional[str] = None) -> None:
+        """
+        Args:
+            config_class (Type[_T]): 配置类
+            path (Optional[str], optional): 共享内存文件路径，为空时从环境变量中读取.
+                Defaults to None.
+        """
+        path = path or environ.get(SHARED_CONFIG_ENV_NAME)
+        if not path:
+            raise ValueError(
+                f"未指定共享内存文件路径，且环境变量 {SHARED_CONFIG_ENV_NAME} 为空"
+            )
+
+        with open(path, "rb") as f:
+            self._buf = mmap(f.fileno(), 0, access=ACCESS_READ)
+
+        self._decoder = Decoder(config_class)
+        self._lock = Lock()
+        self._version = 0
+        self._config: Optional[_T] = None
+        self._refresh()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def _refresh(self) -> None:
+        buf = self._buf
+
+        for _ in range(_MAX_READ_RETRIES):
+            sequence, version, length = unpack_from(_HEADER_FORMAT, buf, 0)
+            if sequence % 2:
+                sleep(0)
+                continue
+
+            data = buf[_HEADER_SIZE : _HEADER_SIZE + length]
+            # 读取期间发生写入，数据可能不完整
+            if unpack_from("<Q", buf, _SEQUENCE_OFFSET)[0] != sequence:
+                continue
+
+            if version != self._version:
+                self._config = self._decoder.decode(data)
+                self._version = version
+            return
+
+        raise RuntimeError("读取共享配置失败：写入持续进行中")
+
+    @property
+    def config(self) -> _T:
+        if unpack_from("<Q", self._buf, _VERSION_OFFSET)[0] != self._version:
+            with self._lock:
+                self._refresh()
+
+        return self._config  # type: ignore
+
+    def close(self) -> None:
+        self._buf.close()
@@ -0,0 +1,279 @@
+from ctypes import CDLL, get_errno
+from ctypes.util import find_library
+from os import close as os_close
+from os import read as os_read
+from os import stat, strerror
+from os.path import abspath, basename, dirname
+from select import select
+from struct import calcsize, unpack_from
+from sys import platform
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import (
+    Any,
+    Callable,
+    FrozenSet,
+    Generic,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from msgspec import Struct
+from msgspec.structs import fields
+
+from sspeedup.config import _load_config
+
+_T = TypeVar("_T", bound=Struct)
+
+# 以下常量来自 <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0x00000800
+_IN_CLOEXEC = 0x00080000
+_INOTIFY_EVENT_HEADER = "iIII"
+_INOTIFY_EVENT_HEADER_SIZE = calcsize(_INOTIFY_EVENT_HEADER)
+
+
+def get_changed_fields(old: Any, new: Any, *, prefix: str = "") -> Set[str]:
+    """比较两个配置对象，返回发生变化的字段路径，嵌套字段以 . 分隔"""
+    if type(old) is not type(new) or not isinstance(old, Struct):
+        return set() if old == new else {prefix.rstrip(".") or "*"}
+
+    result: Set[str] = set()
+    for field in fields(old):
+        old_value = getattr(old, field.name)
+        new_value = getattr(new, field.name)
+        if old_value == new_value:
+            continue
+
+        if isinstance(old_value, Struct) and type(old_value) is type(new_value):
+            result.update(
+                get_changed_fields(
+                    old_value, new_value, prefix=f"{prefix}{field.name}."
+                )
+            )
+        else:
+            result.add(f"{prefix}{field.name}")
+
+    return result
+
+
+class _PollingWatcher:
+    def __init__(self, file_name: str, *, interval: float) -> None:
+        self._file_name = file_name
+        self._interval = interval
+        self._last_state = self._get_state()
+
+    def _get_state(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            result = stat(self._file_name)
+        except FileNotFoundError:
+            return None
+
+        return (result.st_mtime_ns, result.st_size, result.st_ino)
+
+    def wait(self, timeout: float, stop_event: Event) -> bool:
+        """等待文件变化，返回等待期间文件是否发生变化"""
+        stop_event.wait(min(timeout, self._interval))
+
+        state = self._get_state()
+        if state == self._last_state:
+            return False
+
+        self._last_state = state
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifyWatcher:
+    def __init__(self, file_name: str) -> None:
+        libc = CDLL(find_library("c") or "libc.so.6", use_errno=True)
+
+        self._fd: int = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(get_errno(), strerror(get_errno()))
+
+        # 监听所在目录而非文件本身，编辑器保存时可能以新文件替换原文件
+        self._name = basename(file_name).encode()
+        watch_descriptor = libc.inotify_add_watch(
+            self._fd,
+            (dirname(abspath(file_name)) or ".").encode(),
+            _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE,
+        )
+        if watch_descriptor < 0:
+            errno = get_errno()
+            os_close(self._fd)
+            raise OSError(errno, strerror(errno))
+
+    def wait(self, timeout: float, stop_event: Event) -> bool:
+        """等待文件变化，返回等待期间文件是否发生变化"""
+        del stop_event
+        readable, _, _ = select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+
+        try:
+            data = os_read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+
+        changed = False
+        offset = 0
+        while offset < len(data):
+            _, _, _, name_length = unpack_from(_INOTIFY_EVENT_HEADER, data, offset)
+            offset += _INOTIFY_EVENT_HEADER_SIZE
+            name = data[offset : offset + name_length].rstrip(b"\0")
+            offset += name_length
+            if name == self._name:
+                changed = True
+
+        return changed
+
+    def close(self) -> None:
+        os_close(self._fd)
+
+
+class ConfigWatcher(Generic[_T]):
+    """监听配置文件变化并自动重新加载
+
+    新配置在后台线程中解析，解析成功后直接替换引用，
+    读取 config 属性时无需加锁，且总能得到一个完整的配置对象。
+    """
+
+    def __init__(
+        self,
+        config_class: Type[_T],
+        *,
+        file_name: str = "config.yaml",
+        debounce: float = 0.5,
+        poll_interval: float = 1,
+        use_inotify: bool = True,
+        success_callback: Optional[Callable[[_T, FrozenSet[str]], None]] = None,
+        failed_callback: Optional[Callable[[Exception], None]] = None,
+    ) -> None:
+        """
+        Args:
+            config_class (Type[_T]): 配置类
+            file_name (str, optional): 配置文件路径. Defaults to "config.yaml".
+            debounce (float, optional): 文件最后一次变化后，等待该时长（秒）
+                再重新加载，避免读取到写入一半的文件. Defaults to 0.5.
+            poll_interval (float, optional): 无法使用 inotify 时，
+                检查文件变化的间隔（秒）. Defaults to 1.
+            use_inotify (bool, optional): 在 Linux 上使用 inotify 监听文件变化.
+                Defaults to True.
+            success_callback (Optional[Callable], optional):
+                配置发生变化时调用，参数为新配置与发生变化的字段路径.
+                Defaults to None.
+            failed_callback (Optional[Callable], optional):
+                重新加载失败时调用，此时继续使用原配置. Defaults to None.
+        """
+        if debounce < 0:
+            raise ValueError("debounce 不能小于 0")
+        if poll_interval <= 0:
+            raise ValueError("poll_interval 必须大于 0")
+
+        self._config_class = config_class
+        self._file_name = file_name
+        self._debounce = debounce
+        self._poll_interval = poll_interval
+        self._use_inotify = use_inotify and platform.startswith("linux")
+        self._success_callback = success_callback
+        self._failed_callback = failed_callback
+
+        self._config: _T = _load_config(config_class, file_name=file_name)
+        self._version = 0
+
+        self._reload_lock = Lock()
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+
+    @property
+    def config(self) -> _T:
+        return self._config
+
+    @property
+    def version(self) -> int:
+        """配置版本号，每次配置发生变化时加 1"""
+        return self._version
+
+    def reload(self) -> bool:
+        """重新加载配置文件
+
+        Returns:
+            bool: 配置是否发生变化，加载失败时为 False
+        """
+        with self._reload_lock:
+            try:
+                new_config = _load_config(self._config_class, file_name=self._file_name)
+            except Exception as e:
+                if self._failed_callback:
+                    self._failed_callback(e)
+                return False
+
+            changed_fields = frozenset(get_changed_fields(self._config, new_config))
+            if not changed_fields:
+                return False
+
+            # 替换引用是原子操作，读取方不会看到部分更新的配置
+            self._config = new_config
+            self._version += 1
+
+        if self._success_callback:
+            self._success_callback(new_config, changed_fields)
+        return True
+
+    def _create_watcher(self) -> Any:
+        if self._use_inotify:
+            try:
+                return _InotifyWatcher(self._file_name)
+            except (OSError, AttributeError):
+                # libc 中没有 inotify 函数，或监听数达到上限
+                pass
+
+        return _PollingWatcher(self._file_name, interval=self._poll_interval)
+
+    def _loop(self) -> None:
+        watcher = self._create_watcher()
+        last_change_time: Optional[float] = None
+
+        try:
+            while not self._stop_event.is_set():
+                if last_change_time is None:
+                    timeout = self._poll_interval
+                else:
+                    timeout = max(0, last_change_time + self._debounce - monotonic())
+
+                if watcher.wait(timeout, self._stop_event):
+                    last_change_time = monotonic()
+                    continue
+
+                if (
+                    last_change_time is not None
+                    and monotonic() - last_change_time >= self._debounce
+                ):
+                    last_change_time = None
+                    self.reload()
+        finally:
+            watcher.close()
+
+    def start(self) -> None:
+        if self._thread:
+            return
+
+        self._stop_event.clear()
+        self._thread = Thread(target=self._loop, name="config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
@@ -11,10 +11,13 @@ class FeishuAuthToken:
         app_id: str,
         app_secret: str,
         network_client: Optional[AsyncClient] = None,
+        base_url: str = "https://open.feishu.cn",
     ) -> None:
         self._app_id = app_id
         self._app_secret = app_secret
         self._network_client = network_client if network_client else AsyncClient()
+        # 可替换为本地模拟服务的地址
+        self._base_url = base_url.rstrip("/")
 
         self._token: Optional[str] = None
         self._token_expire_time: Optional[datetime] = None
@@ -34,7 +37,7 @@ class FeishuAuthToken:
             "app_secret": self._app_secret,
         }
         response = await self._network_client.post(
-            "https://open.feishu.cn/open-apis/auth/v3/tenant_access_token/internal",
+            f"{self._base_url}/open-apis/auth/v3/tenant_access_token/internal",
             json=data,
         )
 
@@ -1,13 +1,31 @@
-from typing import Any, AsyncGenerator, Dict, Generic, Optional, Sequence, TypeVar
+from asyncio import Queue, Semaphore, create_task, gather
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-from httpx import AsyncClient
+from httpx import AsyncClient, HTTPError
 from msgspec import Struct, convert, to_builtins
 
 from sspeedup.feishu.auth import FeishuAuthToken
-from sspeedup.feishu.bitable.structs import _BitableRecord
+from sspeedup.feishu.bitable.structs import BitableBatchResult, _BitableRecord
 
 _T = TypeVar("_T")
 
+# 批量接口单次请求最多包含的记录数
+MAX_BATCH_SIZE = 500
+# 获取记录接口每页最多包含的记录数
+MAX_PAGE_SIZE = 500
+
 
 class Bitable(Generic[_T]):
     def __init__(
@@ -18,62 +36,127 @@ class Bitable(Generic[_T]):
         table_id: str,
         table_struct: _T,
         network_client: Optional[AsyncClient] = None,
+        base_url: str = "https://open.feishu.cn",
     ) -> None:
         self._auth_token = auth_token
         self._app_id = app_id
         self._table_id = table_id
         self._table_struct = table_struct
         self._network_client = network_client if network_client else AsyncClient()
+        # 可替换为本地模拟服务的地址
+        self._records_url = (
+            f"{base_url.rstrip('/')}/open-apis/bitable/v1/apps/"
+            f"{app_id}/tables/{table_id}/records"
+        )
+
+    @property
+    def table_struct(self) -> _T:
+        return self._table_struct
+
+    async def _get_records_page(
+        self, params: Dict[str, Any], headers: Dict[str, str]
+    ) -> Tuple[List[_BitableRecord[_T]], Optional[str]]:
+        response = await self._network_client.get(
+            self._records_url,
+            params=params,
+            headers=headers,
+        )
+        response_json = response.json()
+
+        if response_json["code"] != 0:
+            raise Exception(
+                f"获取表格记录数据失败（{response_json['code']}）：{response_json['msg']}"
+            )
+
+        data = response_json["data"]
+        records = convert(
+            # 避免无数据时报错
+            data.get("items") or [],
+            type=List[_BitableRecord[self._table_struct]],  # type: ignore
+        )
+        # 如果有更多数据，则返回下一页的 page_token
+        return records, data["page_token"] if data["has_more"] else None
 
     async def iter_records(
         self,
         view_id: Optional[str] = None,
         filter: Optional[str] = None,  # noqa: A002
         sort: Optional[str] = None,
-        page_size: int = 20,
+        page_size: Optional[int] = None,
+        prefetch: int = 0,
+        automatic_fields: bool = False,
     ) -> AsyncGenerator[_BitableRecord[_T], None]:
+        """遍历表格记录
+
+        Args:
+            view_id (Optional[str], optional): 视图 ID. Defaults to None.
+            filter (Optional[str], optional): 筛选条件. Defaults to None.
+            sort (Optional[str], optional): 排序条件. Defaults to None.
+            page_size (Optional[int], optional): 每页记录数，为空时，
+                开启预取则为 500（最大值），否则为 20. Defaults to None.
+            prefetch (int, optional): 预先获取的页数，大于 0 时，
+                处理当前页的同时在后台获取之后的页面. Defaults to 0.
+            automatic_fields (bool, optional): 返回记录的最后更新时间.
+                Defaults to False.
+        """
+        if prefetch < 0:
+            raise ValueError("prefetch 不能小于 0")
+        if page_size is None:
+            page_size = MAX_PAGE_SIZE if prefetch else 20
+
         headers = {"Authorization": f"Bearer {await self._auth_token.get_token()}"}
-        params = {
+        params: Dict[str, Any] = {
             "view_id": view_id,
             "filter": filter,
             "sort": sort,
             "page_size": page_size,
         }
+        if automatic_fields:
+            params["automatic_fields"] = "true"
 
-        has_more: Optional[bool] = None
-        page_token: Optional[str] = None
+        if not prefetch:
+            while True:
+                records, page_token = await self._get_records_page(params, headers)
+                for record in records:
+                    yield record
 
-        while True:
-            # 如果有更多数据，则在新的请求中携带 page_token
-            if has_more:
-                params.update({"page_token": page_token})
+                if not page_token:
+                    return
+                params["page_token"] = page_token
 
-            response = await self._network_client.get(
-                f"https://open.feishu.cn/open-apis/bitable/v1/apps/"
-                f"{self._app_id}/tables/{self._table_id}/records",
-                params=params,
-                headers=headers,
-            )
-            response_json = response.json()
+        # 队列已满时暂停获取，避免处理速度较慢时占用过多内存
+        queue: "Queue[Union[List[_BitableRecord[_T]], Exception, None]]" = Queue(
+            maxsize=prefetch
+        )
 
-            if response_json["code"] != 0:
-                raise Exception(
-                    f"获取表格记录数据失败（{response_json['code']}）：{response_json['msg']}"
-                )
+        async def fetch_pages() -> None:
+            try:
+                while True:
+                    records, page_token = await self._get_records_page(params, headers)
+                    await queue.put(records)
 
-            has_more = response_json["data"]["has_more"]
-            page_token = response_json["data"]["page_token"] if has_more else None
+                    if not page_token:
+                        break
+                    params["page_token"] = page_token
+            except Exception as e:
+                await queue.put(e)
+            else:
+                await queue.put(None)
 
-            # 避免无数据时报错
-            if response_json["data"].get("items"):
-                for item in response_json["data"]["items"]:
-                    yield convert(
-                        item,
-                        type=_BitableRecord[self._table_struct],  # type: ignore
-                    )
+        task = create_task(fetch_pages())
+        try:
+            while True:
+                page = await queue.get()
+                if page is None:
+                    return
+                if isinstance(page, Exception):
+                    raise page
 
-            if not has_more:
-                return
+                for record in page:
+                    yield record
+        finally:
+            # 提前停止遍历时，同时停止获取剩余页面
+            task.cancel()
 
     async def add_record(self, record: Struct) -> None:
         headers = {"Authorization": f"Bearer {await self._auth_token.get_token()}"}
@@ -81,8 +164,7 @@ class Bitable(Generic[_T]):
             "fields": to_builtins(record),
         }
         response = await self._network_client.post(
-            f"https://open.feishu.cn/open-apis/bitable/v1/apps/"
-            f"{self._app_id}/tables/{self._table_id}/records",
+            self._records_url,
             json=data,
             headers=headers,
         )
@@ -100,8 +182,7 @@ class Bitable(Generic[_T]):
             "fields": fields,
         }
         response = await self._network_client.put(
-            f"https://open.feishu.cn/open-apis/bitable/v1/apps/"
-            f"{self._app_id}/tables/{self._table_id}/records/{record_id}",
+            f"{self._records_url}/{record_id}",
             json=data,
             headers=headers,
         )
@@ -116,8 +197,7 @@ class Bitable(Generic[_T]):
     async def delete_record(self, record_id: str) -> None:
         headers = {"Authorization": f"Bearer {await self._auth_token.get_token()}"}
         response = await self._network_client.delete(
-            f"https://open.feishu.cn/open-apis/bitable/v1/apps/"
-            f"{self._app_id}/tables/{self._table_id}/records/{record_id}",
+            f"{self._records_url}/{record_id}",
             headers=headers,
         )
 
@@ -127,3 +207,191 @@ class Bitable(Generic[_T]):
             raise Exception(
                 f"删除表格记录数据失败（{response_json['code']}）：{response_json['msg']}"
             )
+
+    async def _batch_request(
+        self,
+        *,
+        action_name: str,
+        path: str,
+        items: Sequence[Any],
+        get_record_id: Callable[[Any], Optional[str]],
+        parse_response: Callable[
+            [Dict[str, Any], Sequence[Any]], List[BitableBatchResult]
+        ],
+        batch_size: int,
+        concurrency: int,
+    ) -> List[BitableBatchResult]:
+        if not 0 < batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size 必须在 1 到 {MAX_BATCH_SIZE} 之间")
+        if concurrency <= 0:
+            raise ValueError("concurrency 必须大于 0")
+        if not items:
+            return []
+
+        # 所有分块共用同一个 Token
+        headers = {"Authorization": f"Bearer {await self._auth_token.get_token()}"}
+        semaphore = Semaphore(concurrency)
+
+        async def send(chunk: Sequence[Any]) -> List[BitableBatchResult]:
+            async with semaphore:
+                try:
+                    response = await self._network_client.post(
+                        f"{self._records_url}/{path}",
+                        json={"records": chunk},
+                        headers=headers,
+                    )
+                    response_json = response.json()
+                except (HTTPError, ValueError) as e:
+                    error = f"{action_name}失败：{e!r}"
+                else:
+                    if response_json["code"] == 0:
+                        return parse_response(response_json["data"], chunk)
+                    error = (
+                        f"{action_name}失败（{response_json['code']}）："
+                        f"{response_json['msg']}"
+                    )
+
+            # 单个分块失败不影响其它分块，该分块中的所有记录均视为失败
+            return [
+                BitableBatchResult(ok=False, record_id=get_record_id(x), error=error)
+                for x in chunk
+            ]
+
+        chunk_results = await gather(
+            *(send(items[i : i + batch_size]) for i in range(0, len(items), batch_size))
+        )
+        return [result for chunk in chunk_results for result in chunk]
+
+    async def batch_add_records(
+        self,
+        records: Sequence[Struct],
+        *,
+        batch_size: int = MAX_BATCH_SIZE,
+        concurrency: int = 5,
+    ) -> List[BitableBatchResult]:
+        """批量添加表格记录
+
+        Args:
+            records (Sequence[Struct]): 要添加的记录
+            batch_size (int, optional): 单次请求包含的记录数. Defaults to 500.
+            concurrency (int, optional): 同时进行的请求数. Defaults to 5.
+
+        Returns:
+            List[BitableBatchResult]: 与传入记录顺序一致的结果
+        """
+
+        def parse_response(
+            data: Dict[str, Any], chunk: Sequence[Any]
+        ) -> List[BitableBatchResult]:
+            # 返回的记录与请求中的记录顺序一致
+            created = data.get("records") or []
+            if len(created) != len(chunk):
+                return [
+                    BitableBatchResult(
+                        ok=False, error="添加表格记录数据失败：返回记录数不一致"
+                    )
+                ] * len(chunk)
+
+            return [
+                BitableBatchResult(ok=True, record_id=item["record_id"])
+                for item in created
+            ]
+
+        return await self._batch_request(
+            action_name="添加表格记录数据",
+            path="batch_create",
+            items=[{"fields": to_builtins(record)} for record in records],
+            get_record_id=lambda _: None,
+            parse_response=parse_response,
+            batch_size=batch_size,
+            concurrency=concurrency,
+        )
+
+    async def batch_update_records(
+        self,
+        records: Sequence[Tuple[str, Dict[str, Any]]],
+        *,
+        batch_size: int = MAX_BATCH_SIZE,
+        concurrency: int = 5,
+    ) -> List[BitableBatchResult]:
+        """批量更新表格记录
+
+        Args:
+            records (Sequence[Tuple[str, Dict[str, Any]]]): 记录 ID 与要更新的字段
+            batch_size (int, optional): 单次请求包含的记录数. Defaults to 500.
+            concurrency (int, optional): 同时进行的请求数. Defaults to 5.
+
+        Returns:
+            List[BitableBatchResult]: 与传入记录顺序一致的结果
+        """
+
+        def parse_response(
+            data: Dict[str, Any], chunk: Sequence[Any]
+        ) -> List[BitableBatchResult]:
+            updated = {item["record_id"] for item in data.get("records") or []}
+            return [
+                BitableBatchResult(ok=True, record_id=x["record_id"])
+                if x["record_id"] in updated
+                else BitableBatchResult(
+                    ok=False, record_id=x["record_id"], error="更新表格记录数据失败"
+                )
+                for x in chunk
+            ]
+
+        return await self._batch_request(
+            action_name="更新表格记录数据",
+            path="batch_update",
+            items=[
+                {"record_id": record_id, "fields": fields}
+                for record_id, fields in records
+            ],
+            get_record_id=lambda x: x["record_id"],
+            parse_response=parse_response,
+            batch_size=batch_size,
+            concurrency=concurrency,
+        )
+
+    async def batch_delete_records(
+        self,
+        record_ids: Sequence[str],
+        *,
+        batch_size: int = MAX_BATCH_SIZE,
+        concurrency: int = 5,
+    ) -> List[BitableBatchResult]:
+        """批量删除表格记录
+
+        Args:
+            record_ids (Sequence[str]): 要删除的记录 ID
+            batch_size (int, optional): 单次请求包含的记录数. Defaults to 500.
+            concurrency (int, optional): 同时进行的请求数. Defaults to 5.
+
+        Returns:
+            List[BitableBatchResult]: 与传入记录顺序一致的结果
+        """
+
+        def parse_response(
+            data: Dict[str, Any], chunk: Sequence[Any]
+        ) -> List[BitableBatchResult]:
+            deleted = {
+                item["record_id"]
+                for item in data.get("records") or []
+                if item.get("deleted")
+            }
+            return [
+                BitableBatchResult(ok=True, record_id=x)
+                if x in deleted
+                else BitableBatchResult(
+                    ok=False, record_id=x, error="删除表格记录数据失败"
+                )
+                for x in chunk
+            ]
+
+        return await self._batch_request(
+            action_name="删除表格记录数据",
+            path="batch_delete",
+            items=list(record_ids),
+            get_record_id=lambda x: x,
+            parse_response=parse_response,
+            batch_size=batch_size,
+            concurrency=concurrency,
+        )
@@ -0,0 +1,358 @@
+from asyncio import Lock
+from bisect import bisect_left, bisect_right
+from contextlib import suppress
+from hashlib import blake2b
+from os import fdopen, replace, unlink
+from os.path import basename, dirname
+from tempfile import mkstemp
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+)
+
+from msgspec import DecodeError, Struct
+from msgspec.inspect import type_info
+from msgspec.msgpack import Decoder, Encoder
+from msgspec.structs import fields as struct_fields
+
+from sspeedup.feishu.bitable import Bitable
+from sspeedup.feishu.bitable.structs import _BitableRecord
+from sspeedup.sync_to_async import sync_to_async
+
+_T = TypeVar("_T")
+
+
+class _MirrorSnapshot(Struct, Generic[_T], array_like=True, frozen=True):
+    # 表格结构的指纹，表格结构修改后本地文件失效
+    struct_fingerprint: str
+    cursor: Optional[int]
+    records: List[_BitableRecord[_T]]
+
+
+def _get_index_values(value: Any) -> Iterable[Any]:
+    # 多选等列表类型字段按其中的每一项建立索引
+    if value is None:
+        return ()
+    if isinstance(value, list):
+        return [x for x in value if x is not None]
+    return (value,)
+
+
+class _FieldIndex:
+    def __init__(self) -> None:
+        self._record_ids: Dict[Any, Set[str]] = {}
+        # 范围查询时才排序，记录变化后重新排序
+        self._sorted_values: Optional[List[Any]] = None
+
+    def add(self, record_id: str, value: Any) -> None:
+        for item in _get_index_values(value):
+            record_ids = self._record_ids.get(item)
+            if record_ids is None:
+                self._record_ids[item] = {record_id}
+                self._sorted_values = None
+            else:
+                record_ids.add(record_id)
+
+    def remove(self, record_id: str, value: Any) -> None:
+        for item in _get_index_values(value):
+            record_ids = self._record_ids.get(item)
+            if record_ids is None:
+                continue
+
+            record_ids.discard(record_id)
+            if not record_ids:
+                del self._record_ids[item]
+                self._sorted_values = None
+
+    def equal(self, value: Any) -> Set[str]:
+        return self._record_ids.get(value, set())
+
+    def range(
+        self,
+        min_value: Any,
+        max_value: Any,
+        *,
+        include_min: bool,
+        include_max: bool,
+    ) -> List[str]:
+        if self._sorted_values is None:
+            try:
+                self._sorted_values = sorted(self._record_ids)
+            except TypeError:
+                raise ValueError("字段值的类型不一致，无法进行范围查询") from None
+
+        values = self._sorted_values
+        start = 0
+        end = len(values)
+        if min_value is not None:
+            start = (bisect_left if include_min else bisect_right)(values, min_value)
+        if max_value is not None:
+            end = (bisect_right if include_max else bisect_left)(values, max_value)
+
+        return [
+            record_id
+            for value in values[start:end]
+            for record_id in sorted(self._record_ids[value])
+        ]
+
+
+class BitableMirror(Generic[_T]):
+    """多维表格的本地副本
+
+    首次同步时获取全部记录，之后仅获取最后更新时间晚于上次同步的记录。
+    记录保存在内存中，指定 file_name 时同时以 msgpack 格式保存到本地文件，
+    重启后可从文件恢复，无需再次获取全部记录。
+
+    增量同步无法发现已删除的记录，需定期调用 refresh(full=True) 进行全量同步。
+    """
+
+    def __init__(
+        self,
+        bitable: Bitable[_T],
+        *,
+        file_name: Optional[str] = None,
+        modified_time_field: Optional[str] = None,
+        index_fields: Sequence[str] = (),
+        view_id: Optional[str] = None,
+        prefetch: int = 2,
+    ) -> None:
+        """
+        Args:
+            bitable (Bitable[_T]): 要同步的表格
+            file_name (Optional[str], optional): 本地文件路径，为空时仅保存在内存中.
+                Defaults to None.
+            modified_time_field (Optional[str], optional): 表格中「最后更新时间」
+                类型字段的名称，为空时每次均进行全量同步. Defaults to None.
+            index_fields (Sequence[str], optional): 建立索引的字段，
+                为表格结构中的属性名. Defaults to ().
+            view_id (Optional[str], optional): 视图 ID. Defaults to None.
+            prefetch (int, optional): 获取记录时预先获取的页数. Defaults to 2.
+        """
+        table_struct = bitable.table_struct
+        field_names = {x.name for x in struct_fields(table_struct)}  # type: ignore
+        for name in index_fields:
+            if name not in field_names:
+                raise ValueError(f"{name} 不是表格结构中的字段")
+
+        self._bitable = bitable
+        self._file_name = file_name
+        self._modified_time_field = modified_time_field
+        self._view_id = view_id
+        self._prefetch = prefetch
+
+        self._fingerprint = blake2b(
+            f"{type_info(table_struct)!r}".encode(),  # type: ignore
+            digest_size=16,
+        ).hexdigest()
+        self._encoder = Encoder()
+        self._decoder = Decoder(_MirrorSnapshot[table_struct])  # type: ignore
+
+        self._records: Dict[str, _BitableRecord[_T]] = {}
+        self._indexes = {name: _FieldIndex() for name in index_fields}
+        # 已同步记录的最后更新时间最大值（毫秒时间戳），使用服务端时间避免时钟偏差
+        self._cursor: Optional[int] = None
+        self._refresh_lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[_BitableRecord[_T]]:
+        return iter(list(self._records.values()))
+
+    def __contains__(self, record_id: object) -> bool:
+        return record_id in self._records
+
+    @property
+    def cursor(self) -> Optional[int]:
+        return self._cursor
+
+    def get(self, record_id: str) -> Optional[_BitableRecord[_T]]:
+        return self._records.get(record_id)
+
+    def _get_index(self, field: str) -> _FieldIndex:
+        index = self._indexes.get(field)
+        if index is None:
+            raise ValueError(f"字段 {field} 未建立索引")
+
+        return index
+
+    def find(self, field: str, value: Any) -> List[_BitableRecord[_T]]:
+        """查找字段值等于 value 的记录，列表类型字段查找包含 value 的记录"""
+        return [self._records[x] for x in sorted(self._get_index(field).equal(value))]
+
+    def find_range(
+        self,
+        field: str,
+        *,
+        min_value: Any = None,
+        max_value: Any = None,
+        include_min: bool = True,
+        include_max: bool = True,
+    ) -> List[_BitableRecord[_T]]:
+        """查找字段值在指定范围内的记录，按字段值升序排列
+
+        Args:
+            field (str): 字段
+            min_value (Any, optional): 最小值，为空时不限制. Defaults to None.
+            max_value (Any, optional): 最大值，为空时不限制. Defaults to None.
+            include_min (bool, optional): 是否包含最小值. Defaults to True.
+            include_max (bool, optional): 是否包含最大值. Defaults to True.
+        """
+        record_ids = self._get_index(field).range(
+            min_value, max_value, include_min=include_min, include_max=include_max
+        )
+        # 列表类型字段的记录可能出现多次
+        return [self._records[x] for x in dict.fromkeys(record_ids)]
+
+    def _add_to_indexes(self, record: _BitableRecord[_T]) -> None:
+        for name, index in self._indexes.items():
+            index.add(record.record_id, getattr(record.fields, name))
+
+    def _remove_from_indexes(self, record: _BitableRecord[_T]) -> None:
+        for name, index in self._indexes.items():
+            index.remove(record.record_id, getattr(record.fields, name))
+
+    def _replace_all(
+        self, records: Iterable[_BitableRecord[_T]], cursor: Optional[int]
+    ) -> None:
+        self._records = {x.record_id: x for x in records}
+        self._indexes = {name: _FieldIndex() for name in self._indexes}
+        for record in self._records.values():
+            self._add_to_indexes(record)
+        self._cursor = cursor
+
+    def load(self) -> bool:
+        """从本地文件恢复记录
+
+        Returns:
+            bool: 是否成功恢复，文件不存在或表格结构已修改时为 False
+        """
+        if not self._file_name:
+            return False
+
+        try:
+            with open(self._file_name, "rb") as f:
+                snapshot = self._decoder.decode(f.read())
+        except (OSError, DecodeError):
+            return False
+
+        if snapshot.struct_fingerprint != self._fingerprint:
+            return False
+
+        self._replace_all(snapshot.records, snapshot.cursor)
+        return True
+
+    def _get_snapshot(self) -> "_MirrorSnapshot[_T]":
+        return _MirrorSnapshot(
+            struct_fingerprint=self._fingerprint,
+            cursor=self._cursor,
+            records=list(self._records.values()),
+        )
+
+    def _write_snapshot(self, file_name: str, snapshot: "_MirrorSnapshot[_T]") -> None:
+        data = self._encoder.encode(snapshot)
+        # 临时文件权限为 0600，且文件名随机，多个进程同时写入时互不影响
+        fd, temp_file_name = mkstemp(
+            prefix=f"{basename(file_name)}.",
+            suffix=".tmp",
+            dir=dirname(file_name) or ".",
+        )
+        try:
+            with fdopen(fd, "wb") as f:
+                f.write(data)
+            # 替换是原子操作，其它进程不会读取到写入一半的文件
+            replace(temp_file_name, file_name)
+        except OSError:
+            unlink(temp_file_name)
+            raise
+
+    def save(self) -> None:
+        if not self._file_name:
+            return
+
+        self._write_snapshot(self._file_name, self._get_snapshot())
+
+    async def _fetch(self, filter: Optional[str]) -> List[_BitableRecord[_T]]:  # noqa: A002
+        return [
+            record
+            async for record in self._bitable.iter_records(
+                view_id=self._view_id,
+                filter=filter,
+                prefetch=self._prefetch,
+                automatic_fields=True,
+            )
+        ]
+
+    def _get_cursor(
+        self, records: Iterable[_BitableRecord[_T]], cursor: Optional[int]
+    ) -> Optional[int]:
+        for record in records:
+            if record.last_modified_time is not None and (
+                cursor is None or record.last_modified_time > cursor
+            ):
+                cursor = record.last_modified_time
+
+        return cursor
+
+    async def refresh(self, *, full: bool = False) -> int:
+        """与表格同步
+
+        未指定 modified_time_field、尚未同步过或 full 为 True 时进行全量同步，
+        否则仅获取上次同步后更新的记录。同步完成后保存到本地文件。
+
+        Returns:
+            int: 新增、修改与删除的记录数
+        """
+        async with self._refresh_lock:
+            if full or self._cursor is None or not self._modified_time_field:
+                changed = await self._refresh_full()
+            else:
+                changed = await self._refresh_incremental()
+
+            if changed and self._file_name:
+                # 编码与写入耗时与记录数成正比，在线程池中执行，避免阻塞事件循环
+                with suppress(OSError):
+                    await sync_to_async(
+                        self._write_snapshot, self._file_name, self._get_snapshot()
+                    )
+
+        return changed
+
+    async def _refresh_full(self) -> int:
+        records = await self._fetch(None)
+
+        new_ids = {x.record_id for x in records}
+        changed = sum(x.record_id not in new_ids for x in self._records.values())
+        changed += sum(self._records.get(x.record_id) != x for x in records)
+
+        self._replace_all(records, self._get_cursor(records, None))
+        return changed
+
+    async def _refresh_incremental(self) -> int:
+        # 使用大于等于，避免遗漏与上次同步的最后一条记录同一毫秒内更新的记录
+        records = await self._fetch(
+            f"CurrentValue.[{self._modified_time_field}]>={self._cursor}"
+        )
+
+        changed = 0
+        for record in records:
+            old_record = self._records.get(record.record_id)
+            if old_record == record:
+                continue
+
+            if old_record is not None:
+                self._remove_from_indexes(old_record)
+            self._records[record.record_id] = record
+            self._add_to_indexes(record)
+            changed += 1
+
+        self._cursor = self._get_cursor(records, self._cursor)
+        return changed
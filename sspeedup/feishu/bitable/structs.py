@@ -1,4 +1,4 @@
-from typing import Generic, List, TypeVar
+from typing import Generic, List, Optional, TypeVar
 
 from msgspec import Struct
 
@@ -13,6 +13,15 @@ _T = TypeVar("_T")
 class _BitableRecord(Struct, Generic[_T], **_BITABLE_STRUCT_CONFIG):
     record_id: str
     fields: _T
+    # 仅在获取记录时指定 automatic_fields 才会返回
+    last_modified_time: Optional[int] = None
+
+
+class BitableBatchResult(Struct, **_BITABLE_STRUCT_CONFIG):
+    ok: bool
+    # 新增记录失败时为空
+    record_id: Optional[str] = None
+    error: Optional[str] = None
 
 
 class BitableLink(Struct, **_BITABLE_STRUCT_CONFIG):
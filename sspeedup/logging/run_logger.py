@@ -1,5 +1,4 @@
 import sys
-from asyncio import run as asyncio_run
 from atexit import register as atexit_register
 from datetime import datetime
 from enum import Enum
@@ -17,6 +16,7 @@ from typing import Any, Dict, List, Optional, Union
 from msgspec import Struct
 from msgspec import to_builtins as convert_obj_to_dict
 
+from sspeedup.async_to_sync import async_to_sync
 from sspeedup.colorful_print import BackgroundColor, ForegroundColor, with_color
 
 _RECORD_STRUCT_CONFIG: Dict[str, Any] = {
@@ -291,10 +291,8 @@ class RunLogger:
             self._mongo_collection.insert_many(data_to_save)  # type: ignore
         elif self._mongo_collection.__class__.__name__ == "AsyncIOMotorCollection":  # type: ignore
             # Motor
-            async def _save() -> None:
-                await self._mongo_collection.insert_many(data_to_save)
-
-            asyncio_run(_save())
+            # 在常驻的后台事件循环中执行，避免每次保存都创建新的事件循环
+            async_to_sync(self._mongo_collection.insert_many, data_to_save)
 
     def _auto_save_func(self) -> None:
         while True:
@@ -0,0 +1,340 @@
+from asyncio import AbstractEventLoop, gather, get_running_loop
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from os import register_at_fork
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from msgspec.structs import replace
+from pymongo import MongoClient
+from pymongo.monitoring import (
+    ConnectionCheckedInEvent,
+    ConnectionCheckedOutEvent,
+    ConnectionCheckOutFailedEvent,
+    ConnectionCheckOutStartedEvent,
+    ConnectionClosedEvent,
+    ConnectionCreatedEvent,
+    ConnectionPoolListener,
+    ConnectionReadyEvent,
+    PoolClearedEvent,
+    PoolClosedEvent,
+    PoolCreatedEvent,
+    PoolReadyEvent,
+)
+
+from sspeedup.config.blocks import MongoDBConfig
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+
+@dataclass
+class MongoPoolStats:
+    # 当前打开的连接数
+    connections: int = 0
+    # 当前被借出的连接数
+    checked_out: int = 0
+    connections_created: int = 0
+    connections_closed: int = 0
+    checkouts: int = 0
+    # 等待可用连接超时（连接池耗尽）的次数
+    checkout_timeouts: int = 0
+    checkout_errors: int = 0
+    pool_cleared: int = 0
+    # 借出连接的累计与最大等待时间（秒），需要 PyMongo 4.9 及以上版本
+    checkout_wait_time: float = 0
+    max_checkout_wait_time: float = 0
+
+    def __post_init__(self) -> None:
+        self._lock = Lock()
+
+    def record_connection_created(self) -> None:
+        with self._lock:
+            self.connections += 1
+            self.connections_created += 1
+
+    def record_connection_closed(self) -> None:
+        with self._lock:
+            self.connections -= 1
+            self.connections_closed += 1
+
+    def record_checkout(self, wait_time: float) -> None:
+        with self._lock:
+            self.checked_out += 1
+            self.checkouts += 1
+            self.checkout_wait_time += wait_time
+            self.max_checkout_wait_time = max(self.max_checkout_wait_time, wait_time)
+
+    def record_checkout_failed(self, reason: str) -> None:
+        with self._lock:
+            if reason == "timeout":
+                self.checkout_timeouts += 1
+            else:
+                self.checkout_errors += 1
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.checked_out -= 1
+
+    def record_pool_cleared(self) -> None:
+        with self._lock:
+            self.pool_cleared += 1
+
+    def snapshot(self) -> "MongoPoolStats":
+        with self._lock:
+            return MongoPoolStats(
+                connections=self.connections,
+                checked_out=self.checked_out,
+                connections_created=self.connections_created,
+                connections_closed=self.connections_closed,
+                checkouts=self.checkouts,
+                checkout_timeouts=self.checkout_timeouts,
+                checkout_errors=self.checkout_errors,
+                pool_cleared=self.pool_cleared,
+                checkout_wait_time=self.checkout_wait_time,
+                max_checkout_wait_time=self.max_checkout_wait_time,
+            )
+
+
+class _PoolStatsListener(ConnectionPoolListener):
+    """所有服务端节点的连接池共用一份统计数据"""
+
+    def __init__(self, stats: MongoPoolStats) -> None:
+        self._stats = stats
+
+    def pool_created(self, event: PoolCreatedEvent) -> None:
+        pass
+
+    def pool_ready(self, event: PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: PoolClearedEvent) -> None:
+        self._stats.record_pool_cleared()
+
+    def pool_closed(self, event: PoolClosedEvent) -> None:
+        pass
+
+    def connection_created(self, event: ConnectionCreatedEvent) -> None:
+        self._stats.record_connection_created()
+
+    def connection_ready(self, event: ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: ConnectionClosedEvent) -> None:
+        self._stats.record_connection_closed()
+
+    def connection_check_out_started(
+        self, event: ConnectionCheckOutStartedEvent
+    ) -> None:
+        pass
+
+    def connection_check_out_failed(self, event: ConnectionCheckOutFailedEvent) -> None:
+        self._stats.record_checkout_failed(event.reason)
+
+    def connection_checked_out(self, event: ConnectionCheckedOutEvent) -> None:
+        self._stats.record_checkout(getattr(event, "duration", 0))
+
+    def connection_checked_in(self, event: ConnectionCheckedInEvent) -> None:
+        self._stats.record_checkin()
+
+
+_ClientKey = Tuple[MongoDBConfig, bool]
+
+_LOCK = Lock()
+_SYNC_CLIENTS: Dict[MongoDBConfig, MongoClient] = {}
+_AsyncClients = Dict[MongoDBConfig, "AsyncIOMotorClient"]
+# Motor 客户端绑定事件循环，需按事件循环区分
+# 客户端持有事件循环的强引用，无法使用弱引用字典，以 id 为键，并在事件循环关闭后移除
+_ASYNC_CLIENTS: Dict[int, Tuple[AbstractEventLoop, _AsyncClients]] = {}
+_STATS: Dict[_ClientKey, MongoPoolStats] = {}
+
+
+def _reset_after_fork() -> None:
+    global _LOCK
+
+    # 父进程的客户端在子进程中不可用，且不能在子进程中关闭，直接丢弃
+    _LOCK = Lock()
+    _SYNC_CLIENTS.clear()
+    _ASYNC_CLIENTS.clear()
+    _STATS.clear()
+
+
+register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _get_client_key(config: MongoDBConfig) -> MongoDBConfig:
+    # 仅数据库不同的配置共用同一个客户端
+    return replace(config, database="")
+
+
+def _get_client_kwargs(config: MongoDBConfig, stats: MongoPoolStats) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {
+        "host": config.host,
+        "port": config.port,
+        "maxPoolSize": config.max_pool_size,
+        "minPoolSize": config.min_pool_size,
+        "maxIdleTimeMS": config.max_idle_time_ms,
+        "waitQueueTimeoutMS": config.wait_queue_timeout_ms,
+        "connectTimeoutMS": config.connect_timeout_ms,
+        "serverSelectionTimeoutMS": config.server_selection_timeout_ms,
+        "socketTimeoutMS": config.socket_timeout_ms,
+        "event_listeners": [_PoolStatsListener(stats)],
+    }
+    if config.compressors:
+        kwargs["compressors"] = ",".join(config.compressors)
+        kwargs["zlibCompressionLevel"] = config.zlib_compression_level
+
+    return kwargs
+
+
+def get_mongo_client(config: MongoDBConfig) -> MongoClient:
+    """获取当前进程中与配置对应的共享 PyMongo 客户端
+
+    连接参数相同的配置共用同一个客户端及连接池，fork 后的子进程会创建新的客户端。
+    """
+    key = _get_client_key(config)
+    client = _SYNC_CLIENTS.get(key)
+    if client:
+        return client
+
+    with _LOCK:
+        client = _SYNC_CLIENTS.get(key)
+        if not client:
+            stats = _STATS.setdefault((key, False), MongoPoolStats())
+            client = MongoClient(**_get_client_kwargs(config, stats))
+            _SYNC_CLIENTS[key] = client
+
+    return client
+
+
+def get_async_mongo_client(config: MongoDBConfig) -> "AsyncIOMotorClient":
+    """获取当前事件循环中与配置对应的共享 Motor 客户端，需在事件循环中调用
+
+    连接参数相同的配置共用同一个客户端及连接池，fork 后的子进程会创建新的客户端。
+    事件循环关闭后，其对应的客户端在下次调用本函数时关闭并移除。
+    """
+    # 仅使用同步客户端时无需安装 Motor
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    loop = get_running_loop()
+    key = _get_client_key(config)
+
+    entry = _ASYNC_CLIENTS.get(id(loop))
+    if entry and entry[0] is loop:
+        client = entry[1].get(key)
+        if client:
+            return client
+
+    with _LOCK:
+        closed_clients = _pop_closed_loop_clients()
+
+        entry = _ASYNC_CLIENTS.get(id(loop))
+        if not entry or entry[0] is not loop:
+            entry = (loop, {})
+            _ASYNC_CLIENTS[id(loop)] = entry
+        clients = entry[1]
+
+        client = clients.get(key)
+        if not client:
+            stats = _STATS.setdefault((key, True), MongoPoolStats())
+            client = AsyncIOMotorClient(
+                **_get_client_kwargs(config, stats), io_loop=loop
+            )
+            clients[key] = client
+
+    for item in closed_clients:
+        item.close()
+
+    return client
+
+
+def _pop_closed_loop_clients() -> List["AsyncIOMotorClient"]:
+    # 需持有 _LOCK 调用，返回已关闭的事件循环对应的客户端，由调用方关闭
+    result: List["AsyncIOMotorClient"] = []
+    for loop_id, (loop, clients) in list(_ASYNC_CLIENTS.items()):
+        if loop.is_closed():
+            del _ASYNC_CLIENTS[loop_id]
+            result.extend(clients.values())
+
+    return result
+
+
+def _get_warm_up_connections(config: MongoDBConfig, connections: Optional[int]) -> int:
+    if connections is None:
+        connections = max(config.min_pool_size, 1)
+    if connections <= 0:
+        raise ValueError("connections 必须大于 0")
+
+    return min(connections, config.max_pool_size or connections)
+
+
+def warm_up_mongo_client(
+    config: MongoDBConfig, *, connections: Optional[int] = None
+) -> None:
+    """在启动时建立连接，避免首批请求承担建立连接与服务端选择的延迟
+
+    Args:
+        config (MongoDBConfig): 数据库配置
+        connections (Optional[int], optional): 建立的连接数，
+            为空时为 min_pool_size（至少为 1）. Defaults to None.
+    """
+    connections = _get_warm_up_connections(config, connections)
+    client = get_mongo_client(config)
+
+    # 并发执行命令，使连接池同时借出多个连接
+    with ThreadPoolExecutor(connections, thread_name_prefix="mongo-warm-up") as pool:
+        for future in [
+            pool.submit(client.admin.command, "ping") for _ in range(connections)
+        ]:
+            future.result()
+
+
+async def warm_up_async_mongo_client(
+    config: MongoDBConfig, *, connections: Optional[int] = None
+) -> None:
+    """在启动时建立连接，避免首批请求承担建立连接与服务端选择的延迟
+
+    Args:
+        config (MongoDBConfig): 数据库配置
+        connections (Optional[int], optional): 建立的连接数，
+            为空时为 min_pool_size（至少为 1）. Defaults to None.
+    """
+    connections = _get_warm_up_connections(config, connections)
+    client = get_async_mongo_client(config)
+
+    await gather(*(client.admin.command("ping") for _ in range(connections)))
+
+
+def get_mongo_pool_stats() -> Dict[str, MongoPoolStats]:
+    """获取当前进程中各客户端的连接池统计数据
+
+    键为 host:port，异步客户端带有 async 后缀。
+    """
+    with _LOCK:
+        items = list(_STATS.items())
+
+    result: Dict[str, MongoPoolStats] = {}
+    for (key, is_async), stats in items:
+        base_name = f"{key.host}:{key.port}" + (" async" if is_async else "")
+        # 连接参数不同但地址相同的客户端
+        name, suffix = base_name, 2
+        while name in result:
+            name = f"{base_name} #{suffix}"
+            suffix += 1
+        result[name] = stats.snapshot()
+
+    return result
+
+
+def close_mongo_clients() -> None:
+    with _LOCK:
+        clients: List[Any] = list(_SYNC_CLIENTS.values())
+        for _, item in _ASYNC_CLIENTS.values():
+            clients.extend(item.values())
+
+        _SYNC_CLIENTS.clear()
+        _ASYNC_CLIENTS.clear()
+        _STATS.clear()
+
+    for client in clients:
+        client.close()
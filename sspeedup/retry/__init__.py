@@ -1,3 +1,5 @@
 from sspeedup.retry.deco import retry
-from sspeedup.retry.event import RetryEvent
+from sspeedup.retry.event import HedgeEvent, RetryEvent
+from sspeedup.retry.hedge import HedgeStats, hedge
 from sspeedup.retry.policy import constant_backoff_policy, exponential_backoff_policy
+from sspeedup.retry.telemetry import RetryStats, get_retry_stats, report_retry_stats
@@ -4,6 +4,7 @@ from typing import Any, Callable, Optional, Sequence, Type, Union
 
 from sspeedup.retry.event import RetryEvent
 from sspeedup.retry.policy import PolicyReturn
+from sspeedup.retry.telemetry import _register
 
 
 def retry(
@@ -14,11 +15,14 @@ def retry(
     on_retry: Optional[Callable[[RetryEvent], None]] = None,
 ) -> Callable:
     def outer(func: Callable) -> Any:
+        stats = _register(func)
+
         @wraps(func)
         def inner(*args: Any, **kwargs: Any) -> Any:
             if max_tries <= 0:
                 raise ValueError("max_tries 必须大于 0")
             if max_tries == 1:  # 只尝试一次，相当于不使用重试装饰器
+                stats.record_attempt()
                 return func(*args, **kwargs)
 
             nonlocal exceptions
@@ -32,11 +36,13 @@ def retry(
             last_exception = None
             policy_obj = policy()
             while tries <= max_tries - 1:
+                stats.record_attempt()
                 try:
                     return func(*args, **kwargs)
                 except handle_exceptions as e:
                     last_exception = e
                     wait = next(policy_obj)
+                    stats.record_retry(e, wait)
                     if on_retry:
                         on_retry(
                             RetryEvent(func=func, exception=e, tries=tries, wait=wait)
@@ -45,10 +51,12 @@ def retry(
                     tries += 1
 
             if last_exception:
+                stats.record_give_up()
                 raise last_exception
 
             return None
 
+        inner.retry_stats = stats  # type: ignore
         return inner
 
     return outer
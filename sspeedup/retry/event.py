@@ -8,3 +8,10 @@ class RetryEvent:
     exception: Exception
     tries: int
     wait: float
+
+
+@dataclass
+class HedgeEvent:
+    func: Callable
+    delay: float
+    won: bool
@@ -0,0 +1,124 @@
+from asyncio import FIRST_COMPLETED, Task, ensure_future, wait
+from collections import deque
+from dataclasses import dataclass
+from functools import wraps
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Deque, Optional, Set
+
+from sspeedup.retry.event import HedgeEvent
+
+
+@dataclass
+class HedgeStats:
+    calls: int = 0
+    hedged: int = 0
+    hedge_won: int = 0
+    # 因并发对冲数量达到上限而放弃对冲的次数
+    hedge_skipped: int = 0
+
+
+def _get_percentile(samples: Deque[float], percentile: float) -> float:
+    sorted_samples = sorted(samples)
+    index = min(int(len(sorted_samples) * percentile / 100), len(sorted_samples) - 1)
+    return sorted_samples[index]
+
+
+def hedge(
+    *,
+    delay: Optional[float] = None,
+    percentile: Optional[float] = None,
+    min_samples: int = 20,
+    window_size: int = 200,
+    max_concurrent_hedges: int = 10,
+    on_hedge: Optional[Callable[[HedgeEvent], None]] = None,
+) -> Callable:
+    """对冲请求装饰器，仅适用于幂等的异步函数
+
+    首次调用在对冲延迟内未完成时，发起第二次调用，返回先成功的结果并取消另一个。
+
+    Args:
+        delay (Optional[float], optional): 固定对冲延迟（秒）. Defaults to None.
+        percentile (Optional[float], optional): 以近期耗时的该百分位数作为对冲延迟，
+            样本不足 min_samples 时使用 delay. Defaults to None.
+        min_samples (int, optional): 启用百分位延迟所需的最少样本数. Defaults to 20.
+        window_size (int, optional): 保留的近期耗时样本数. Defaults to 200.
+        max_concurrent_hedges (int, optional): 同时进行的对冲请求上限. Defaults to 10.
+        on_hedge (Optional[Callable[[HedgeEvent], None]], optional): 发生对冲时的回调.
+            Defaults to None.
+    """
+    if delay is None and percentile is None:
+        raise ValueError("delay 与 percentile 至少需要指定一个")
+    if percentile is not None and not 0 < percentile < 100:
+        raise ValueError("percentile 必须在 0 到 100 之间")
+    if max_concurrent_hedges <= 0:
+        raise ValueError("max_concurrent_hedges 必须大于 0")
+
+    def outer(func: Callable[..., Awaitable[Any]]) -> Any:
+        samples: Deque[float] = deque(maxlen=window_size)
+        stats = HedgeStats()
+        hedges_in_flight = 0
+
+        def get_delay() -> Optional[float]:
+            if percentile is not None and len(samples) >= min_samples:
+                return _get_percentile(samples, percentile)
+
+            return delay
+
+        @wraps(func)
+        async def inner(*args: Any, **kwargs: Any) -> Any:
+            nonlocal hedges_in_flight
+
+            stats.calls += 1
+            hedge_delay = get_delay()
+            start_time = perf_counter()
+            primary = ensure_future(func(*args, **kwargs))
+
+            if hedge_delay is None:
+                result = await primary
+                samples.append(perf_counter() - start_time)
+                return result
+
+            try:
+                done, _ = await wait({primary}, timeout=hedge_delay)
+            except BaseException:
+                primary.cancel()
+                raise
+
+            if done or hedges_in_flight >= max_concurrent_hedges:
+                if not done:
+                    stats.hedge_skipped += 1
+                result = await primary
+                samples.append(perf_counter() - start_time)
+                return result
+
+            stats.hedged += 1
+            hedges_in_flight += 1
+            backup = ensure_future(func(*args, **kwargs))
+            pending: Set[Task] = {primary, backup}
+            try:
+                while pending:
+                    done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+                    for task in done:
+                        if task.cancelled() or task.exception() is not None:
+                            continue
+
+                        # 主请求未完成时，以当前耗时作为其耗时的下界
+                        samples.append(perf_counter() - start_time)
+                        won = task is backup
+                        if won:
+                            stats.hedge_won += 1
+                        if on_hedge:
+                            on_hedge(HedgeEvent(func=func, delay=hedge_delay, won=won))
+                        return task.result()
+
+                # 两次调用均失败，抛出主请求的异常
+                return primary.result()
+            finally:
+                hedges_in_flight -= 1
+                for task in pending:
+                    task.cancel()
+
+        inner.hedge_stats = stats  # type: ignore
+        return inner
+
+    return outer
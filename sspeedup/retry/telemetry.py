@@ -0,0 +1,114 @@
+from copy import deepcopy
+from dataclasses import dataclass, field
+from threading import Event, Lock, Thread
+from typing import TYPE_CHECKING, Callable, Dict
+
+if TYPE_CHECKING:
+    from sspeedup.logging.run_logger import RunLogger
+
+
+@dataclass
+class RetryStats:
+    attempts: int = 0
+    retries: int = 0
+    give_ups: int = 0
+    sleep_time: float = 0
+    # 异常类型名称 -> 触发重试的次数
+    exceptions: Dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._lock = Lock()
+
+    def record_attempt(self) -> None:
+        with self._lock:
+            self.attempts += 1
+
+    def record_retry(self, exception: Exception, wait: float) -> None:
+        name = type(exception).__name__
+        with self._lock:
+            self.retries += 1
+            self.sleep_time += wait
+            self.exceptions[name] = self.exceptions.get(name, 0) + 1
+
+    def record_give_up(self) -> None:
+        with self._lock:
+            self.give_ups += 1
+
+    def snapshot(self) -> "RetryStats":
+        with self._lock:
+            return RetryStats(
+                attempts=self.attempts,
+                retries=self.retries,
+                give_ups=self.give_ups,
+                sleep_time=self.sleep_time,
+                exceptions=deepcopy(self.exceptions),
+            )
+
+
+_STATS: Dict[str, RetryStats] = {}
+_STATS_LOCK = Lock()
+
+
+def _get_func_name(func: Callable) -> str:
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def _register(func: Callable) -> RetryStats:
+    name = _get_func_name(func)
+    with _STATS_LOCK:
+        # 同名函数（如多次定义的闭包）共享统计数据
+        if name not in _STATS:
+            _STATS[name] = RetryStats()
+        return _STATS[name]
+
+
+def get_retry_stats() -> Dict[str, RetryStats]:
+    with _STATS_LOCK:
+        items = list(_STATS.items())
+
+    return {name: stats.snapshot() for name, stats in items}
+
+
+def report_retry_stats(
+    logger: "RunLogger", *, interval: int = 300
+) -> Callable[[], None]:
+    """定期将重试统计数据写入运行日志
+
+    仅上报自上次上报以来有新调用的函数，统计数据为累计值。
+
+    Args:
+        logger (RunLogger): 运行日志记录器
+        interval (int, optional): 上报间隔（秒）. Defaults to 300.
+
+    Returns:
+        Callable[[], None]: 调用后停止上报
+    """
+    if interval <= 0:
+        raise ValueError("interval 必须大于 0")
+
+    stop_event = Event()
+    last_attempts: Dict[str, int] = {}
+
+    def report() -> None:
+        for name, stats in get_retry_stats().items():
+            if last_attempts.get(name) == stats.attempts:
+                continue
+            last_attempts[name] = stats.attempts
+
+            logger.info(
+                "重试统计",
+                func=name,
+                attempts=stats.attempts,
+                retries=stats.retries,
+                give_ups=stats.give_ups,
+                sleep_time=round(stats.sleep_time, 3),
+                exceptions=stats.exceptions,
+            )
+
+    def loop() -> None:
+        while not stop_event.wait(interval):
+            report()
+
+    Thread(target=loop, name="retry-stats-report", daemon=True).start()
+
+    return stop_event.set
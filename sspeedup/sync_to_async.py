@@ -1,12 +1,455 @@
-from asyncio import Future, get_running_loop
-from concurrent.futures import ThreadPoolExecutor
+from asyncio import FIRST_COMPLETED, Future, get_running_loop, wait, wrap_future
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import Future as ConcurrentFuture
+from contextvars import Context, copy_context
+from dataclasses import dataclass
 from functools import partial
-from typing import Any, Callable, TypeVar
+from itertools import islice
+from os import cpu_count
+from threading import Lock
+from time import perf_counter
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 _T = TypeVar("_T")
+_U = TypeVar("_U")
 
-POOL = ThreadPoolExecutor(max_workers=8)
+PoolKind = Literal["thread", "process"]
+
+POOL: Executor = ThreadPoolExecutor(max_workers=8)
+
+
+class _PoolConfig(NamedTuple):
+    max_workers: int
+    kind: PoolKind = "thread"
+    adaptive: bool = False
+    max_adaptive_workers: Optional[int] = None
+    adaptive_wait_threshold: float = 0.05
+
+
+_DEFAULT_POOL_CONFIGS: Dict[str, _PoolConfig] = {
+    # 阻塞 I/O（数据库、文件读写等）
+    "io": _PoolConfig(max_workers=16),
+    # CPU 密集型任务（分词等）
+    "cpu": _PoolConfig(max_workers=cpu_count() or 1),
+}
+
+
+@dataclass
+class PoolStats:
+    max_workers: int
+    submitted: int
+    completed: int
+    cancelled: int
+    active: int
+    queue_depth: int
+    # 进程池无法区分排队与执行时间，全部计入执行时间
+    total_wait_time: float
+    max_wait_time: float
+    total_run_time: float
+    max_run_time: float
+
+
+class _PoolStatsRecorder:
+    def __init__(self, *, is_process_pool: bool = False) -> None:
+        self._is_process_pool = is_process_pool
+        self._lock = Lock()
+
+        self._submitted = 0
+        self._started = 0
+        self._completed = 0
+        self._cancelled = 0
+        self._total_wait_time: float = 0
+        self._max_wait_time: float = 0
+        self._total_run_time: float = 0
+        self._max_run_time: float = 0
+
+    def on_submit(self) -> None:
+        with self._lock:
+            self._submitted += 1
+
+    def on_start(self, wait_time: float) -> None:
+        with self._lock:
+            self._started += 1
+            self._total_wait_time += wait_time
+            self._max_wait_time = max(self._max_wait_time, wait_time)
+
+    def on_finish(self, run_time: float) -> None:
+        with self._lock:
+            self._completed += 1
+            self._total_run_time += run_time
+            self._max_run_time = max(self._max_run_time, run_time)
+
+    def on_cancel(self) -> None:
+        with self._lock:
+            self._cancelled += 1
+
+    def snapshot(self, max_workers: int) -> PoolStats:
+        with self._lock:
+            in_flight = self._submitted - self._completed - self._cancelled
+            if self._is_process_pool:
+                active = min(in_flight, max_workers)
+                queue_depth = in_flight - active
+            else:
+                active = self._started - self._completed
+                queue_depth = in_flight - active
+
+            return PoolStats(
+                max_workers=max_workers,
+                submitted=self._submitted,
+                completed=self._completed,
+                cancelled=self._cancelled,
+                active=active,
+                queue_depth=queue_depth,
+                total_wait_time=self._total_wait_time,
+                max_wait_time=self._max_wait_time,
+                total_run_time=self._total_run_time,
+                max_run_time=self._max_run_time,
+            )
+
+
+_POOLS: Dict[str, Tuple[Executor, _PoolStatsRecorder]] = {
+    "default": (POOL, _PoolStatsRecorder())
+}
+_POOLS_LOCK = Lock()
+
+
+class _AdaptiveThreadPoolExecutor(ThreadPoolExecutor):
+    """任务排队等待时间超过阈值时自动扩容的线程池"""
+
+    def __init__(
+        self,
+        max_workers: int,
+        *,
+        max_adaptive_workers: int,
+        wait_threshold: float,
+        thread_name_prefix: str = "",
+    ) -> None:
+        super().__init__(max_workers, thread_name_prefix=thread_name_prefix)
+        self._max_adaptive_workers = max_adaptive_workers
+        self._wait_threshold = wait_threshold
+        self._grow_lock = Lock()
+
+    def _on_task_start(self, wait: float) -> None:
+        if wait <= self._wait_threshold:
+            return
+
+        with self._grow_lock:
+            if self._max_workers >= self._max_adaptive_workers:
+                return
+            self._max_workers += 1
+
+        # 立即创建新线程，以处理已在队列中等待的任务
+        # 空闲信号量可能因线程刚完成任务而虚高，每次调用消耗一个信号量或创建一个线程
+        with self._shutdown_lock:
+            while (
+                not self._shutdown
+                and len(self._threads) < self._max_workers
+                and not self._work_queue.empty()
+            ):
+                self._adjust_thread_count()
+
+    def submit(
+        self, fn: Callable[..., _T], /, *args: Any, **kwargs: Any
+    ) -> "ConcurrentFuture[_T]":
+        submit_time = perf_counter()
+
+        def run() -> _T:
+            self._on_task_start(perf_counter() - submit_time)
+            return fn(*args, **kwargs)
+
+        return super().submit(run)
+
+
+def _create_pool(name: str, config: _PoolConfig) -> Executor:
+    if config.max_workers <= 0:
+        raise ValueError("max_workers 必须大于 0")
+
+    if config.kind == "process":
+        if config.adaptive:
+            raise ValueError("进程池不支持自适应扩容")
+        return ProcessPoolExecutor(max_workers=config.max_workers)
+
+    if config.adaptive:
+        max_adaptive_workers = config.max_adaptive_workers or config.max_workers * 4
+        if max_adaptive_workers < config.max_workers:
+            raise ValueError("max_adaptive_workers 不能小于 max_workers")
+
+        return _AdaptiveThreadPoolExecutor(
+            config.max_workers,
+            max_adaptive_workers=max_adaptive_workers,
+            wait_threshold=config.adaptive_wait_threshold,
+            thread_name_prefix=f"sync-to-async-{name}",
+        )
+
+    return ThreadPoolExecutor(
+        max_workers=config.max_workers, thread_name_prefix=f"sync-to-async-{name}"
+    )
+
+
+def configure_pool(
+    name: str,
+    *,
+    max_workers: int,
+    kind: PoolKind = "thread",
+    adaptive: bool = False,
+    max_adaptive_workers: Optional[int] = None,
+    adaptive_wait_threshold: float = 0.05,
+) -> None:
+    """配置命名执行器池，应在启动时调用
+
+    若同名池已存在，则替换之，原有池在其中任务完成后关闭。
+    替换 default 池时同时更新模块级的 POOL，原有池可能仍被直接引用，不会关闭。
+
+    Args:
+        name (str): 池名称，default 为 sync_to_async 使用的池
+        max_workers (int): 最大工作线程 / 进程数
+        kind (PoolKind, optional): 线程池或进程池，进程池仅能执行可序列化的函数.
+            Defaults to "thread".
+        adaptive (bool, optional): 是否根据任务排队时间自动扩容，仅支持线程池.
+            Defaults to False.
+        max_adaptive_workers (Optional[int], optional): 自动扩容的线程数上限，
+            默认为 max_workers 的四倍. Defaults to None.
+        adaptive_wait_threshold (float, optional): 触发扩容的排队时间（秒）.
+            Defaults to 0.05.
+    """
+    global POOL
+
+    pool = _create_pool(
+        name,
+        _PoolConfig(
+            max_workers=max_workers,
+            kind=kind,
+            adaptive=adaptive,
+            max_adaptive_workers=max_adaptive_workers,
+            adaptive_wait_threshold=adaptive_wait_threshold,
+        ),
+    )
+
+    recorder = _PoolStatsRecorder(is_process_pool=kind == "process")
+
+    with _POOLS_LOCK:
+        old_pool = _POOLS.get(name)
+        _POOLS[name] = (pool, recorder)
+        if name == "default":
+            POOL = pool
+
+    # 通过 from sspeedup.sync_to_async import POOL 获取的旧池仍可能被使用
+    if old_pool and name != "default":
+        old_pool[0].shutdown(wait=False)
+
+
+def _get_pool_with_recorder(name: str) -> Tuple[Executor, _PoolStatsRecorder]:
+    item = _POOLS.get(name)
+    if item:
+        return item
+
+    with _POOLS_LOCK:
+        if name not in _POOLS:
+            if name not in _DEFAULT_POOL_CONFIGS:
+                raise ValueError(f"执行器池 {name} 不存在")
+            config = _DEFAULT_POOL_CONFIGS[name]
+            _POOLS[name] = (
+                _create_pool(name, config),
+                _PoolStatsRecorder(is_process_pool=config.kind == "process"),
+            )
+
+        return _POOLS[name]
+
+
+def get_pool(name: str) -> Executor:
+    return _get_pool_with_recorder(name)[0]
+
+
+def get_pool_stats() -> Dict[str, PoolStats]:
+    with _POOLS_LOCK:
+        items = list(_POOLS.items())
+
+    return {
+        name: recorder.snapshot(getattr(pool, "_max_workers", 0))
+        for name, (pool, recorder) in items
+    }
+
+
+def shutdown_pools(*, wait: bool = True) -> None:
+    with _POOLS_LOCK:
+        pools = [pool for pool, _ in _POOLS.values()]
+
+    for pool in pools:
+        pool.shutdown(wait=wait)
+
+
+def _run_in_thread(
+    recorder: _PoolStatsRecorder,
+    submit_time: float,
+    context: Context,
+    func: Callable[[], _T],
+) -> _T:
+    start_time = perf_counter()
+    recorder.on_start(start_time - submit_time)
+    try:
+        return context.run(func)
+    finally:
+        recorder.on_finish(perf_counter() - start_time)
+
+
+def _submit(pool_name: str, func: Callable[[], _T]) -> "Future[_T]":
+    pool, recorder = _get_pool_with_recorder(pool_name)
+    loop = get_running_loop()
+    recorder.on_submit()
+    submit_time = perf_counter()
+
+    if isinstance(pool, ProcessPoolExecutor):
+        # 上下文无法跨进程传递
+        future = pool.submit(func)
+
+        def on_process_task_done(f: "ConcurrentFuture[_T]") -> None:
+            if f.cancelled():
+                recorder.on_cancel()
+            else:
+                recorder.on_finish(perf_counter() - submit_time)
+
+        future.add_done_callback(on_process_task_done)
+    else:
+        future = pool.submit(
+            _run_in_thread, recorder, submit_time, copy_context(), func
+        )
+
+        def on_thread_task_done(f: "ConcurrentFuture[_T]") -> None:
+            if f.cancelled():
+                recorder.on_cancel()
+
+        future.add_done_callback(on_thread_task_done)
+
+    return wrap_future(future, loop=loop)
+
+
+def sync_to_async_in_pool(
+    pool_name: str, func: Callable[..., _T], *args: Any, **kwargs: Any
+) -> Future[_T]:
+    return _submit(pool_name, partial(func, *args, **kwargs))
 
 
 def sync_to_async(func: Callable[..., _T], *args: Any, **kwargs: Any) -> Future[_T]:
-    return get_running_loop().run_in_executor(POOL, partial(func, *args, **kwargs))
+    return sync_to_async_in_pool("default", func, *args, **kwargs)
+
+
+def _run_chunk(func: Callable[[_U], _T], chunk: List[_U]) -> List[_T]:
+    return [func(x) for x in chunk]
+
+
+def _iter_chunks(items: Iterable[_U], chunk_size: int) -> Iterator[List[_U]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+
+        yield chunk
+
+
+async def sync_to_async_iter(
+    func: Callable[[_U], _T],
+    items: Iterable[_U],
+    *,
+    concurrency: int = 8,
+    chunk_size: int = 1,
+    ordered: bool = True,
+    pool_name: str = "default",
+) -> AsyncGenerator[_T, None]:
+    """在执行器池中对每个元素调用阻塞函数，并以流的形式返回结果
+
+    元素按需从 items 中读取，同一时间最多有 concurrency 个任务在执行器中，
+    故处理大量元素时内存占用保持稳定。
+
+    Args:
+        func (Callable[[_U], _T]): 阻塞函数
+        items (Iterable[_U]): 元素，可以是惰性迭代器
+        concurrency (int, optional): 同时执行的任务数上限. Defaults to 8.
+        chunk_size (int, optional): 每个任务处理的元素数，较大的值可降低调度开销.
+            Defaults to 1.
+        ordered (bool, optional): 是否按元素顺序返回结果，为 False 时按完成顺序返回.
+            Defaults to True.
+        pool_name (str, optional): 执行器池名称. Defaults to "default".
+    """
+    if concurrency <= 0:
+        raise ValueError("concurrency 必须大于 0")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size 必须大于 0")
+
+    chunks = _iter_chunks(items, chunk_size)
+
+    def submit(chunk: List[_U]) -> "Future[List[_T]]":
+        return _submit(pool_name, partial(_run_chunk, func, chunk))
+
+    if ordered:
+        queue: Deque[Future[List[_T]]] = deque()
+        try:
+            for chunk in chunks:
+                queue.append(submit(chunk))
+                if len(queue) >= concurrency:
+                    for result in await queue.popleft():
+                        yield result
+
+            while queue:
+                for result in await queue.popleft():
+                    yield result
+        finally:
+            for future in queue:
+                future.cancel()
+
+        return
+
+    pending: Set[Future[List[_T]]] = {
+        submit(chunk) for chunk in islice(chunks, concurrency)
+    }
+    try:
+        while pending:
+            done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+            # 先补充任务，再返回结果，使执行器在消费者处理结果时保持忙碌
+            for chunk in islice(chunks, len(done)):
+                pending.add(submit(chunk))
+
+            for future in done:
+                for result in future.result():
+                    yield result
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def sync_to_async_map(
+    func: Callable[[_U], _T],
+    items: Iterable[_U],
+    *,
+    concurrency: int = 8,
+    chunk_size: int = 1,
+    ordered: bool = True,
+    pool_name: str = "default",
+) -> List[_T]:
+    return [
+        x
+        async for x in sync_to_async_iter(
+            func,
+            items,
+            concurrency=concurrency,
+            chunk_size=chunk_size,
+            ordered=ordered,
+            pool_name=pool_name,
+        )
+    ]